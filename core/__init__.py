@@ -1,13 +1,33 @@
 """Core modules for API Scraper Pro."""
 
-from .browser import StealthBrowser
-from .crawler import SmartCrawler
-from .interceptor import NetworkInterceptor
-from .database import DatabaseManager
+import importlib
+
+# Submodules are imported on first attribute access (PEP 562), so e.g.
+# DatabaseManager can be used without loading Playwright
+_LAZY = {
+    'StealthBrowser': '.browser',
+    'BrowserPool': '.browser',
+    'SmartCrawler': '.crawler',
+    'NetworkInterceptor': '.interceptor',
+    'DatabaseManager': '.database',
+}
 
 __all__ = [
     'StealthBrowser',
+    'BrowserPool',
     'SmartCrawler',
     'NetworkInterceptor',
     'DatabaseManager',
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -6,7 +6,8 @@ Playwright-based browser with advanced stealth capabilities.
 """
 
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
+from contextlib import asynccontextmanager
 import asyncio
 import random
 from loguru import logger
@@ -22,6 +23,57 @@ except ImportError:
         pass  # No-op if stealth not available
 
 
+# Init scripts run in every new document before page scripts
+STEALTH_SCRIPT = """
+(() => {
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+    
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [
+            {name: 'Chrome PDF Plugin', description: 'Portable Document Format'},
+            {name: 'Chrome PDF Viewer', description: ''}
+        ]
+    });
+    
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['en-US', 'en']
+    });
+    
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+    );
+    
+    const getParameter = WebGLRenderingContext.prototype.getParameter;
+    WebGLRenderingContext.prototype.getParameter = function(parameter) {
+        if (parameter === 37445) return 'Intel Inc.';
+        if (parameter === 37446) return 'Intel Iris OpenGL Engine';
+        return getParameter.apply(this, [parameter]);
+    };
+})();
+"""
+
+MOUSE_MOVEMENT_SCRIPT = """
+(() => {
+    if (window.top !== window) return;
+    const moveRandomly = () => {
+        const x = Math.random() * window.innerWidth;
+        const y = Math.random() * window.innerHeight;
+        const event = new MouseEvent('mousemove', {
+            view: window, bubbles: true, cancelable: true,
+            clientX: x, clientY: y
+        });
+        document.dispatchEvent(event);
+    };
+    setInterval(moveRandomly, 3000 + Math.random() * 2000);
+})();
+"""
+
+
 class StealthBrowser:
     """Browser with built-in bot detection evasion."""
     
@@ -29,8 +81,9 @@ class StealthBrowser:
         self.config = config
         self.playwright = None
         self.browser: Optional[Browser] = None
-        self.context: Optional[BrowserContext] = None
-        self._pages: List[Page] = []
+        self.pool_size = config.get('max_concurrent', 5)
+        self._contexts: List[BrowserContext] = []
+        self._context_pool: Optional[asyncio.Queue] = None
         
     async def initialize(self) -> None:
         """Initialize Playwright browser with stealth settings."""
@@ -42,11 +95,9 @@ class StealthBrowser:
         launch_args = [
             '--disable-blink-features=AutomationControlled',
             '--disable-dev-shm-usage',
-            '--disable-web-security',
             '--disable-features=IsolateOrigins,site-per-process',
             '--no-sandbox',
             '--disable-setuid-sandbox',
-            '--disable-gpu',
         ]
         
         self.browser = await self.playwright.chromium.launch(
@@ -54,8 +105,18 @@ class StealthBrowser:
             args=launch_args
         )
         
-        # Create context with realistic settings
-        self.context = await self.browser.new_context(
+        # One browser process, a bounded pool of isolated contexts
+        self._context_pool = asyncio.Queue()
+        for _ in range(self.pool_size):
+            context = await self._new_context()
+            self._contexts.append(context)
+            self._context_pool.put_nowait(context)
+        
+        logger.success(f"Browser initialized successfully ({self.pool_size} contexts)")
+    
+    async def _new_context(self) -> BrowserContext:
+        """Create context with realistic settings and stealth init scripts."""
+        context = await self.browser.new_context(
             viewport={'width': 1920, 'height': 1080},
             user_agent=self._get_random_user_agent(),
             locale='en-US',
@@ -63,79 +124,35 @@ class StealthBrowser:
             color_scheme='dark',
         )
         
-        logger.success("Browser initialized successfully")
+        # Installed once per context, applied to every page it opens
+        await context.add_init_script(STEALTH_SCRIPT)
+        # Synthetic mousemove events are untrusted, so they only matter when headed
+        if self.config.get('mouse_movements', True) and not self.config.get('headless', True):
+            await context.add_init_script(MOUSE_MOVEMENT_SCRIPT)
         
-    async def new_page(self) -> Page:
-        """Create new page with stealth features."""
-        if not self.context:
+        return context
+    
+    @asynccontextmanager
+    async def acquire_page(self) -> AsyncIterator[Page]:
+        """Borrow a pooled context and yield a new stealth page."""
+        if not self.browser:
             await self.initialize()
-            
-        page = await self.context.new_page()
-        await stealth_async(page)
-        await self._inject_stealth_scripts(page)
-        
-        if self.config.get('mouse_movements', True):
-            await self._setup_mouse_movements(page)
-            
-        self._pages.append(page)
-        logger.debug(f"New page created (total: {len(self._pages)})")
         
-        return page
+        context = await self._context_pool.get()
+        page = None
+        try:
+            page = await context.new_page()
+            await stealth_async(page)
+            logger.debug(f"New page created (free contexts: {self._context_pool.qsize()})")
+            yield page
+        finally:
+            if page:
+                try:
+                    await page.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close page: {e}")
+            self._context_pool.put_nowait(context)
     
-    async def _inject_stealth_scripts(self, page: Page) -> None:
-        """Inject custom stealth scripts."""
-        stealth_script = """
-        () => {
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-            
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [
-                    {name: 'Chrome PDF Plugin', description: 'Portable Document Format'},
-                    {name: 'Chrome PDF Viewer', description: ''}
-                ]
-            });
-            
-            Object.defineProperty(navigator, 'languages', {
-                get: () => ['en-US', 'en']
-            });
-            
-            const originalQuery = window.navigator.permissions.query;
-            window.navigator.permissions.query = (parameters) => (
-                parameters.name === 'notifications' ?
-                    Promise.resolve({ state: Notification.permission }) :
-                    originalQuery(parameters)
-            );
-            
-            const getParameter = WebGLRenderingContext.prototype.getParameter;
-            WebGLRenderingContext.prototype.getParameter = function(parameter) {
-                if (parameter === 37445) return 'Intel Inc.';
-                if (parameter === 37446) return 'Intel Iris OpenGL Engine';
-                return getParameter.apply(this, [parameter]);
-            };
-        }
-        """
-        await page.add_init_script(stealth_script)
-        
-    async def _setup_mouse_movements(self, page: Page) -> None:
-        """Setup realistic mouse movements."""
-        movement_script = """
-        async () => {
-            const moveRandomly = () => {
-                const x = Math.random() * window.innerWidth;
-                const y = Math.random() * window.innerHeight;
-                const event = new MouseEvent('mousemove', {
-                    view: window, bubbles: true, cancelable: true,
-                    clientX: x, clientY: y
-                });
-                document.dispatchEvent(event);
-            };
-            setInterval(moveRandomly, 3000 + Math.random() * 2000);
-        }
-        """
-        await page.evaluate(movement_script)
-        
     def _get_random_user_agent(self) -> str:
         """Get random realistic user agent."""
         user_agents = [
@@ -150,14 +167,13 @@ class StealthBrowser:
         """Close browser and release resources."""
         logger.info("Closing browser...")
         
-        for page in self._pages:
+        for context in self._contexts:
             try:
-                await page.close()
+                await context.close()
             except Exception as e:
-                logger.warning(f"Failed to close page: {e}")
+                logger.warning(f"Failed to close context: {e}")
+        self._contexts.clear()
         
-        if self.context:
-            await self.context.close()
         if self.browser:
             await self.browser.close()
         if self.playwright:
@@ -171,3 +187,52 @@ class StealthBrowser:
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.close()
+
+
+class BrowserPool:
+    """Process-wide warm browser shared across scrape runs."""
+    
+    # Settings baked into the running browser; anything else (e.g. max_depth) can change freely
+    LAUNCH_KEYS = ('headless', 'max_concurrent', 'mouse_movements', 'rotate_user_agent')
+    
+    _browser: Optional[StealthBrowser] = None
+    _launch_settings: Optional[tuple] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _lock: Optional[asyncio.Lock] = None
+    
+    @classmethod
+    async def get(cls, config: Dict[str, Any]) -> StealthBrowser:
+        """Return the shared browser, launching it on first use or config change."""
+        loop = asyncio.get_running_loop()
+        if cls._loop is not loop:
+            # Playwright objects are bound to the loop that started them
+            cls._browser = None
+            cls._loop = loop
+            cls._lock = asyncio.Lock()
+        
+        settings = tuple(config.get(key) for key in cls.LAUNCH_KEYS)
+        async with cls._lock:
+            browser = cls._browser
+            if browser and browser.browser and browser.browser.is_connected() and cls._launch_settings == settings:
+                logger.debug("Reusing warm browser")
+                return browser
+            
+            if browser:
+                await browser.close()
+            
+            cls._browser = StealthBrowser(config)
+            cls._launch_settings = settings
+            try:
+                await cls._browser.initialize()
+            except Exception:
+                cls._browser = None
+                raise
+            return cls._browser
+    
+    @classmethod
+    async def close(cls) -> None:
+        """Close the shared browser, if one is running on this loop."""
+        browser, cls._browser = cls._browser, None
+        cls._launch_settings = None
+        if browser and cls._loop is asyncio.get_running_loop():
+            await browser.close()
@@ -6,12 +6,42 @@ Dynamic website mapping with priority queue.
 """
 
 from playwright.async_api import Page
-from typing import Dict, Any, List, Set, Optional, Tuple
-from urllib.parse import urljoin, urlparse
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable, Iterable, Iterator
+from urllib.parse import urljoin, urlsplit
 from loguru import logger
 import asyncio
-from collections import deque
+import hashlib
+import heapq
 import re
+from collections import OrderedDict
+
+# Try to import pybloom_live (optional)
+try:
+    from pybloom_live import ScalableBloomFilter
+    BLOOM_AVAILABLE = True
+except ImportError:
+    BLOOM_AVAILABLE = False
+
+# Exact-match cache of recently visited URLs in front of the Bloom filter
+RECENT_URLS_MAX = 4096
+
+DEFAULT_PORTS = {'http': ':80', 'https': ':443'}
+
+# Scroll to trigger lazy loading, then collect links (single CDP round trip)
+SCROLL_AND_COLLECT_LINKS = """
+    async () => {
+        const distance = 100;
+        const delay = 100;
+        try {
+            while (window.scrollY + window.innerHeight < document.body.scrollHeight) {
+                window.scrollBy(0, distance);
+                await new Promise(resolve => setTimeout(resolve, delay));
+            }
+        } catch (e) {}
+        const anchors = document.querySelectorAll('a[href]');
+        return [...new Set(Array.from(anchors, a => a.href).filter(href => href))];
+    }
+"""
 
 
 class SmartCrawler:
@@ -22,57 +52,149 @@ class SmartCrawler:
         self.max_depth = config.get('max_depth', 3)
         self.page_delay = config.get('page_delay', 2000) / 1000
         self.timeout = config.get('timeout', 30000)
+        self.max_concurrent = config.get('max_concurrent', 5)
         
-        self.visited_urls: Set[str] = set()
-        self.queue: deque = deque()
-        self.url_depths: Dict[str, int] = {}
+        self.visited = self._new_visited_filter()
+        self.recent: OrderedDict = OrderedDict()
+        self.queue: List[Tuple[int, int, int, str, bytes]] = []
+        self._counter = 0
+        self.url_depths: Dict[bytes, int] = {}
+        self._base_domain: Optional[str] = None
         
         self.priority_patterns = [
             (r'/api/', 10), (r'/graphql', 10), (r'/rest/', 9),
             (r'/v\d+/', 8), (r'/products', 7), (r'/search', 7),
             (r'/data', 7), (r'/users', 6), (r'/posts', 6),
         ]
+        self._compiled_patterns = [
+            (re.compile(pattern, re.IGNORECASE), boost)
+            for pattern, boost in self.priority_patterns
+        ]
+        self._any_priority_pattern = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern, _ in self.priority_patterns),
+            re.IGNORECASE
+        )
         
     def add_url(self, url: str, depth: int = 0, priority: int = 5) -> None:
         """Add URL to crawl queue."""
-        normalized = self._normalize_url(url)
+        normalized, netloc = self._split_normalized(url)
+        key = self._canonical_key(normalized)
         
-        if normalized in self.visited_urls or depth > self.max_depth:
+        if self._is_visited(key) or depth > self.max_depth:
             return
         
-        if not self._is_same_domain(normalized):
+        if not self._is_same_domain(netloc):
             return
         
         calculated_priority = self._calculate_priority(normalized, priority)
-        self.queue.append((calculated_priority, depth, normalized))
-        self.url_depths[normalized] = depth
-        self.queue = deque(sorted(self.queue, key=lambda x: x[0], reverse=True))
+        # Min-heap on negated priority; the counter keeps FIFO order among equal priorities
+        heapq.heappush(self.queue, (-calculated_priority, self._counter, depth, normalized, key))
+        self._counter += 1
+        self.url_depths[key] = depth
         
         logger.debug(f"URL queued: {normalized} (depth: {depth}, priority: {calculated_priority})")
     
     def get_next_url(self) -> Optional[Tuple[int, str]]:
         """Get next URL to crawl."""
         while self.queue:
-            priority, depth, url = self.queue.popleft()
-            if url not in self.visited_urls:
-                self.visited_urls.add(url)
+            _, _, depth, url, key = heapq.heappop(self.queue)
+            if not self._is_visited(key):
+                self._mark_visited(key)
                 return (depth, url)
         return None
     
+    def _new_visited_filter(self):
+        """Create visited URL store (Bloom filter if available)."""
+        if BLOOM_AVAILABLE:
+            return ScalableBloomFilter(initial_capacity=100_000, error_rate=1e-4)
+        logger.debug("pybloom_live not available, tracking visited URLs in a set")
+        return set()
+    
+    def _is_visited(self, key: bytes) -> bool:
+        """Check if URL key was already visited."""
+        return key in self.recent or key in self.visited
+    
+    def _mark_visited(self, key: bytes) -> None:
+        """Mark URL key as visited."""
+        self.visited.add(key)
+        self.recent[key] = None
+        self.recent.move_to_end(key)
+        if len(self.recent) > RECENT_URLS_MAX:
+            self.recent.popitem(last=False)
+    
+    async def crawl_all(
+        self,
+        browser,
+        on_page: Optional[Callable[[Page], Awaitable[None]]] = None,
+        on_crawled: Optional[Callable[[int, str], None]] = None,
+        max_pages: Optional[int] = None,
+        url_filter: Optional[Callable[[str], bool]] = None,
+    ) -> int:
+        """Crawl queued URLs concurrently until the queue is exhausted (or max_pages were started)."""
+        # Small hand-off queue so the heap keeps deciding priority order
+        work: asyncio.Queue = asyncio.Queue()
+        crawled = 0
+        dispatched = 0
+        
+        def refill() -> None:
+            nonlocal dispatched
+            while work.qsize() < self.max_concurrent and (max_pages is None or dispatched < max_pages):
+                next_url = self.get_next_url()
+                if not next_url:
+                    break
+                if url_filter and not url_filter(next_url[1]):
+                    continue
+                work.put_nowait(next_url)
+                dispatched += 1
+        
+        async def worker() -> None:
+            nonlocal crawled
+            while True:
+                depth, url = await work.get()
+                try:
+                    async with browser.acquire_page() as page:
+                        if on_page:
+                            await on_page(page)
+                        links = await self.crawl_page(page, url)
+                    
+                    for link in links:
+                        self.add_url(link, depth=depth + 1)
+                    
+                    crawled += 1
+                    if on_crawled:
+                        on_crawled(depth, url)
+                except Exception as e:
+                    logger.error(f"Worker failed ({url}): {e}")
+                finally:
+                    # Refill before task_done so join() only returns once nothing is left
+                    refill()
+                    work.task_done()
+        
+        refill()
+        workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrent)]
+        try:
+            await work.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        
+        return crawled
+    
     async def crawl_page(self, page: Page, url: str) -> List[str]:
         """Crawl single page and return found links."""
         try:
             logger.info(f"Crawling: {url}")
             
-            response = await page.goto(url, wait_until='networkidle', timeout=self.timeout)
+            response = await page.goto(url, wait_until='domcontentloaded', timeout=self.timeout)
             
             if not response or response.status >= 400:
                 logger.warning(f"HTTP {response.status if response else 'N/A'}: {url}")
                 return []
             
-            await asyncio.sleep(self.page_delay)
-            await self._scroll_page(page)
-            links = await self._extract_links(page, url)
+            raw_links = await self._collect_links(page)
+            links = list(self._extract_links(raw_links, url))
+            await self._wait_for_idle(page)
             
             logger.success(f"Crawled: {url} ({len(links)} links found)")
             return links
@@ -81,87 +203,94 @@ class SmartCrawler:
             logger.error(f"Crawl failed ({url}): {e}")
             return []
     
-    async def _scroll_page(self, page: Page) -> None:
-        """Scroll page to trigger lazy loading."""
+    async def _wait_for_idle(self, page: Page) -> None:
+        """Let pending XHRs finish, waiting at most page_delay."""
+        if self.page_delay <= 0:
+            return
         try:
-            await page.evaluate("""
-                async () => {
-                    const distance = 100;
-                    const delay = 100;
-                    while (window.scrollY + window.innerHeight < document.body.scrollHeight) {
-                        window.scrollBy(0, distance);
-                        await new Promise(resolve => setTimeout(resolve, delay));
-                    }
-                }
-            """)
-        except Exception as e:
-            logger.debug(f"Scroll failed: {e}")
+            await page.wait_for_load_state('networkidle', timeout=self.page_delay * 1000)
+        except Exception:
+            logger.debug(f"Network still busy after {self.page_delay}s: {page.url}")
     
-    async def _extract_links(self, page: Page, base_url: str) -> List[str]:
-        """Extract all links from page."""
+    async def _collect_links(self, page: Page) -> List[str]:
+        """Scroll page to trigger lazy loading and collect raw link hrefs."""
         try:
-            links = await page.evaluate("""
-                () => {
-                    const anchors = Array.from(document.querySelectorAll('a[href]'));
-                    return anchors.map(a => a.href).filter(href => href);
-                }
-            """)
-            
-            normalized_links = []
-            for link in links:
-                try:
-                    absolute_url = urljoin(base_url, link)
-                    normalized = self._normalize_url(absolute_url)
-                    
-                    if normalized in self.visited_urls or not self._is_same_domain(normalized):
-                        continue
-                    
-                    normalized_links.append(normalized)
-                except Exception:
-                    continue
-            
-            return list(set(normalized_links))
-            
+            return await page.evaluate(SCROLL_AND_COLLECT_LINKS)
         except Exception as e:
             logger.debug(f"Link extraction failed: {e}")
             return []
     
+    def _extract_links(self, links: Iterable[str], base_url: str) -> Iterator[str]:
+        """Yield unvisited same-domain links, normalized and deduplicated."""
+        seen = set()
+        for link in links:
+            try:
+                normalized, netloc = self._split_normalized(urljoin(base_url, link))
+            except ValueError:
+                continue  # Malformed URL (e.g. unbalanced IPv6 brackets)
+            
+            key = self._canonical_key(normalized)
+            if key in seen or self._is_visited(key) or not self._is_same_domain(netloc):
+                continue
+            
+            seen.add(key)
+            yield normalized
+    
     def _normalize_url(self, url: str) -> str:
-        """Normalize URL (remove fragment, sort params)."""
-        parsed = urlparse(url)
-        normalized = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+        """Normalize URL (lowercase host, drop fragment and default port, sort params)."""
+        return self._split_normalized(url)[0]
+    
+    def _split_normalized(self, url: str) -> Tuple[str, str]:
+        """Normalize URL and return it with its normalized netloc (single split)."""
+        parsed = urlsplit(url)
+        scheme = parsed.scheme.lower()
         
-        if parsed.query:
-            normalized += f"?{parsed.query}"
+        userinfo, at, host = parsed.netloc.rpartition('@')
+        host = host.lower()
+        default_port = DEFAULT_PORTS.get(scheme)
+        if default_port and host.endswith(default_port):
+            host = host[:-len(default_port)]
+        
+        path = parsed.path
+        if path.endswith('/'):
+            path = path[:-1]
         
-        if normalized.endswith('/') and len(normalized) > 10:
-            normalized = normalized[:-1]
+        netloc = f"{userinfo}{at}{host}"
+        normalized = f"{scheme}://{netloc}{path}"
         
-        return normalized
+        if parsed.query:
+            normalized += '?' + '&'.join(sorted(parsed.query.split('&')))
+        
+        return normalized, netloc
     
-    def _is_same_domain(self, url: str) -> bool:
-        """Check if URL is from same domain."""
-        if not hasattr(self, '_base_domain'):
-            parsed = urlparse(url)
-            self._base_domain = parsed.netloc
+    def _canonical_key(self, normalized: str) -> bytes:
+        """Get fixed-width dedup key for normalized URL."""
+        return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+    
+    def _is_same_domain(self, netloc: str) -> bool:
+        """Check if normalized netloc is the crawl's domain (first seen wins)."""
+        if self._base_domain is None:
+            self._base_domain = netloc
             return True
         
-        parsed = urlparse(url)
-        return parsed.netloc == self._base_domain
+        return netloc == self._base_domain
     
     def _calculate_priority(self, url: str, base_priority: int) -> int:
         """Calculate URL priority based on patterns."""
+        if not self._any_priority_pattern.search(url):
+            return base_priority
+        
         priority = base_priority
-        for pattern, boost in self.priority_patterns:
-            if re.search(pattern, url, re.IGNORECASE):
+        for pattern, boost in self._compiled_patterns:
+            if pattern.search(url):
                 priority += boost
-                logger.debug(f"Priority boost +{boost} for {url} (pattern: {pattern})")
+                logger.debug(f"Priority boost +{boost} for {url} (pattern: {pattern.pattern})")
         return priority
     
     def get_stats(self) -> Dict[str, Any]:
         """Get crawling statistics."""
         return {
-            'visited_urls': len(self.visited_urls),
+            'visited_urls': len(self.visited),
             'queue_size': len(self.queue),
             'max_depth': self.max_depth,
             'urls_by_depth': self._count_by_depth(),
@@ -176,7 +305,9 @@ class SmartCrawler:
     
     def clear(self) -> None:
         """Clear crawler state."""
-        self.visited_urls.clear()
+        self.visited = self._new_visited_filter()
+        self.recent.clear()
         self.queue.clear()
+        self._counter = 0
         self.url_depths.clear()
         logger.debug("Crawler state cleared")
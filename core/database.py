@@ -6,45 +6,149 @@ Manages SQLite database for API data persistence.
 """
 
 import aiosqlite
-from typing import Dict, Any, List, Optional
+import orjson
+import zstandard as zstd
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 from loguru import logger
-from datetime import datetime
+from datetime import datetime, timezone
+import asyncio
 import json
 import os
 from pathlib import Path
 
+# Keys of every endpoint dict, in export column order
+ENDPOINT_COLUMNS = (
+    'id', 'url', 'method', 'first_seen', 'last_seen',
+    'call_count', 'avg_response_size', 'schema',
+)
+
 
 class DatabaseManager:
     """Manages SQLite database for API data."""
     
+    # Hot statements, kept identical so sqlite3's statement cache reuses the prepared form
+    _SQL_INSERT_CALL = """
+        INSERT INTO api_calls (
+            endpoint_id, timestamp, status_code, 
+            response_body, response_headers, request_headers, response_size
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    _SQL_SELECT_EP = "SELECT id FROM api_endpoints WHERE url = ? AND method = ?"
+    
+    _SQL_INSERT_EP = """
+        INSERT INTO api_endpoints (url, method, first_seen, last_seen, schema_json)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    
+    # Fold each endpoint's batched calls into the running average in one statement
+    _SQL_UPDATE_EP = """
+        UPDATE api_endpoints 
+        SET 
+            last_seen = ?,
+            call_count = call_count + ?,
+            avg_response_size = (COALESCE(avg_response_size, 0) * (call_count - 1) + ?) / (call_count - 1 + ?)
+        WHERE id = ?
+    """
+    
+    _SQL_ALL_ENDPOINTS = """
+        SELECT id, url, method, first_seen, last_seen, call_count, avg_response_size, schema_json
+        FROM api_endpoints
+        ORDER BY call_count DESC
+    """
+    
+    # Inserted and updated endpoints both move last_seen forward
+    _SQL_ENDPOINTS_SINCE = """
+        SELECT id, url, method, first_seen, last_seen, call_count, avg_response_size, schema_json
+        FROM api_endpoints
+        WHERE last_seen >= ?
+    """
+    
+    _SQL_SEARCH_WHERE = "call_count BETWEEN ? AND ?"
+    _SQL_SEARCH_URL = " AND url LIKE ? ESCAPE '\\'"
+    _SQL_SEARCH_FTS = " AND id IN (SELECT rowid FROM endpoints_fts WHERE endpoints_fts MATCH ?)"
+    
+    # {table}: api_endpoints, or the temporary table of the UNIQUE(url) migration
+    _SQL_CREATE_ENDPOINTS = """
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL,
+            method TEXT NOT NULL,
+            first_seen TIMESTAMP NOT NULL,
+            last_seen TIMESTAMP NOT NULL,
+            call_count INTEGER DEFAULT 1,
+            avg_response_size INTEGER,
+            schema_json BLOB
+        )
+    """
+    
+    # Trigram index over endpoint URLs, kept in sync with api_endpoints by triggers
+    _SQL_CREATE_FTS = """
+        CREATE VIRTUAL TABLE endpoints_fts USING fts5(
+            url, content='api_endpoints', content_rowid='id', tokenize='trigram'
+        )
+    """
+    
+    _SQL_FTS_TRIGGERS = (
+        """
+        CREATE TRIGGER IF NOT EXISTS api_endpoints_fts_insert AFTER INSERT ON api_endpoints BEGIN
+            INSERT INTO endpoints_fts(rowid, url) VALUES (new.id, new.url);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS api_endpoints_fts_delete AFTER DELETE ON api_endpoints BEGIN
+            INSERT INTO endpoints_fts(endpoints_fts, rowid, url) VALUES ('delete', old.id, old.url);
+        END
+        """,
+        # OF url: the per-flush stats updates must not touch the index
+        """
+        CREATE TRIGGER IF NOT EXISTS api_endpoints_fts_update AFTER UPDATE OF url ON api_endpoints BEGIN
+            INSERT INTO endpoints_fts(endpoints_fts, rowid, url) VALUES ('delete', old.id, old.url);
+            INSERT INTO endpoints_fts(rowid, url) VALUES (new.id, new.url);
+        END
+        """,
+    )
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         db_path = config.get('path', 'data/scraper.db')
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         self.db_path = db_path
         self.connection: Optional[aiosqlite.Connection] = None
+        self.flush_interval = config.get('flush_interval', 500) / 1000
+        self._pending: List[Tuple] = []
+        self._ep_stats: Dict[int, list] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._clock_task: Optional[asyncio.Task] = None
+        self._now_iso = self._utc_now_iso()
+        self._compressor = zstd.ZstdCompressor(level=config.get('compression_level', 3))
+        self._decompressor = zstd.ZstdDecompressor()
+        self._fts = False
         
     async def initialize(self) -> None:
         """Initialize database and create tables."""
         logger.info(f"Initializing database: {self.db_path}")
         self.connection = await aiosqlite.connect(self.db_path)
+        await self._configure_connection()
         await self._create_tables()
+        self._flush_task = asyncio.create_task(self._flusher())
+        self._clock_task = asyncio.create_task(self._clock())
         logger.success("Database initialized")
     
+    async def _configure_connection(self) -> None:
+        """Tune SQLite for write throughput."""
+        # page_size only takes effect on a new database, and must precede WAL
+        await self.connection.execute("PRAGMA page_size=8192")
+        await self.connection.execute("PRAGMA journal_mode=WAL")
+        await self.connection.execute("PRAGMA synchronous=NORMAL")
+        await self.connection.execute("PRAGMA temp_store=MEMORY")
+        await self.connection.execute("PRAGMA mmap_size=268435456")
+        await self.connection.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    
     async def _create_tables(self) -> None:
         """Create database tables."""
-        await self.connection.execute("""
-            CREATE TABLE IF NOT EXISTS api_endpoints (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                url TEXT UNIQUE NOT NULL,
-                method TEXT NOT NULL,
-                first_seen TIMESTAMP NOT NULL,
-                last_seen TIMESTAMP NOT NULL,
-                call_count INTEGER DEFAULT 1,
-                avg_response_size INTEGER,
-                schema_json TEXT
-            )
-        """)
+        await self._migrate_endpoints_table()
+        await self.connection.execute(self._SQL_CREATE_ENDPOINTS.format(table='api_endpoints'))
         
         await self.connection.execute("""
             CREATE TABLE IF NOT EXISTS api_calls (
@@ -52,9 +156,9 @@ class DatabaseManager:
                 endpoint_id INTEGER NOT NULL,
                 timestamp TIMESTAMP NOT NULL,
                 status_code INTEGER NOT NULL,
-                response_body TEXT,
-                response_headers TEXT,
-                request_headers TEXT,
+                response_body BLOB,
+                response_headers BLOB,
+                request_headers BLOB,
                 response_size INTEGER,
                 FOREIGN KEY (endpoint_id) REFERENCES api_endpoints (id)
             )
@@ -73,102 +177,265 @@ class DatabaseManager:
         """)
         
         # Create indexes
-        await self.connection.execute("CREATE INDEX IF NOT EXISTS idx_api_endpoints_url ON api_endpoints(url)")
+        # (url, method) identifies an endpoint; a plain url index only duplicated this
+        await self.connection.execute("DROP INDEX IF EXISTS idx_api_endpoints_url")
+        await self.connection.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_ep_url_method ON api_endpoints(url, method)")
+        await self.connection.execute("CREATE INDEX IF NOT EXISTS idx_ep_call_count ON api_endpoints(call_count)")
+        await self.connection.execute("CREATE INDEX IF NOT EXISTS idx_ep_last_seen ON api_endpoints(last_seen)")
         await self.connection.execute("CREATE INDEX IF NOT EXISTS idx_api_calls_endpoint ON api_calls(endpoint_id)")
         await self.connection.execute("CREATE INDEX IF NOT EXISTS idx_api_calls_timestamp ON api_calls(timestamp)")
         
+        await self._create_search_index()
+        
         await self.connection.commit()
         logger.debug("Database tables created")
     
-    async def save_api_call(self, api_data: Dict[str, Any]) -> int:
-        """Save API call to database."""
+    async def _migrate_endpoints_table(self) -> None:
+        """Rebuild api_endpoints created with UNIQUE(url), so one URL can have several methods."""
+        # The column constraint's implicit index; SQLite can only drop it with the table
+        cursor = await self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'sqlite_autoindex_api_endpoints_1'"
+        )
+        if await cursor.fetchone() is None:
+            return
+        
+        logger.info("Migrating api_endpoints: UNIQUE(url) -> UNIQUE(url, method)")
+        try:
+            await self.connection.execute("BEGIN")
+            await self.connection.execute(self._SQL_CREATE_ENDPOINTS.format(table='api_endpoints_new'))
+            # Ids are kept, so api_calls and the search index stay valid
+            await self.connection.execute("""
+                INSERT INTO api_endpoints_new
+                    (id, url, method, first_seen, last_seen, call_count, avg_response_size, schema_json)
+                SELECT id, url, method, first_seen, last_seen, call_count, avg_response_size, schema_json
+                FROM api_endpoints
+            """)
+            await self.connection.execute("DROP TABLE api_endpoints")
+            await self.connection.execute("ALTER TABLE api_endpoints_new RENAME TO api_endpoints")
+            await self.connection.commit()
+            logger.success("api_endpoints migrated")
+        except Exception as e:
+            await self.connection.rollback()
+            logger.error(f"api_endpoints migration failed (clear the database to fix): {e}")
+    
+    async def _create_search_index(self) -> None:
+        """Create FTS5 trigram index on endpoint URLs (URL search falls back to LIKE without it)."""
+        cursor = await self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'endpoints_fts'"
+        )
+        exists = await cursor.fetchone() is not None
+        
+        try:
+            if not exists:
+                await self.connection.execute(self._SQL_CREATE_FTS)
+                # Index endpoints stored before the index existed
+                await self.connection.execute("INSERT INTO endpoints_fts(endpoints_fts) VALUES ('rebuild')")
+            for trigger in self._SQL_FTS_TRIGGERS:
+                await self.connection.execute(trigger)
+            self._fts = True
+        except aiosqlite.OperationalError as e:
+            logger.warning(f"FTS5 trigram index unavailable, URL search uses LIKE: {e}")
+            self._fts = False
+    
+    async def save_api_call(self, api_data: Dict[str, Any]) -> None:
+        """Queue API call for the next batched insert."""
         try:
             endpoint_id = await self._get_or_create_endpoint(api_data)
+            self._queue_call(endpoint_id, api_data)
+            logger.debug(f"API call queued (pending: {len(self._pending)})")
+            
+        except Exception as e:
+            logger.error(f"Failed to save API call: {e}")
+            raise
+    
+    async def save_api_calls_batch(self, api_calls: List[Dict[str, Any]]) -> None:
+        """Queue several API calls, resolving each distinct endpoint once."""
+        try:
+            endpoint_ids: Dict[Tuple[str, str], int] = {}
+            for api_data in api_calls:
+                key = (api_data['url'], api_data['method'])
+                endpoint_id = endpoint_ids.get(key)
+                if endpoint_id is None:
+                    endpoint_id = endpoint_ids[key] = await self._get_or_create_endpoint(api_data)
+                self._queue_call(endpoint_id, api_data)
             
-            cursor = await self.connection.execute("""
-                INSERT INTO api_calls (
-                    endpoint_id, timestamp, status_code, 
-                    response_body, response_headers, request_headers, response_size
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                endpoint_id, api_data['timestamp'], api_data['status'],
-                json.dumps(api_data['response_body']),
-                json.dumps(api_data['headers']),
-                json.dumps(api_data['request_headers']),
-                api_data['response_size']
-            ))
+            logger.debug(f"{len(api_calls)} API calls queued (pending: {len(self._pending)})")
             
-            call_id = cursor.lastrowid
-            await self._update_endpoint_stats(endpoint_id, api_data)
-            await self.connection.commit()
+        except Exception as e:
+            logger.error(f"Failed to save {len(api_calls)} API calls: {e}")
+            raise
+    
+    def _queue_call(self, endpoint_id: int, api_data: Dict[str, Any]) -> None:
+        """Add API call row to the pending batch."""
+        self._pending.append((
+            endpoint_id, api_data['timestamp'], api_data['status'],
+            self._pack(api_data['response_body']),
+            self._pack(api_data['headers']),
+            self._pack(api_data['request_headers']),
+            api_data['response_size']
+        ))
+        self._update_endpoint_stats(endpoint_id, api_data)
+    
+    async def flush(self) -> None:
+        """Write queued API calls and commit."""
+        if not self.connection:
+            return
+        
+        pending, self._pending = self._pending, []
+        ep_stats, self._ep_stats = self._ep_stats, {}
+        try:
+            if pending:
+                await self.connection.executemany(self._SQL_INSERT_CALL, pending)
             
-            logger.debug(f"API call saved (ID: {call_id})")
-            return call_id
+            if ep_stats:
+                await self.connection.executemany(self._SQL_UPDATE_EP, [
+                    (last_seen, count, size_sum, count, endpoint_id)
+                    for endpoint_id, (count, size_sum, last_seen) in ep_stats.items()
+                ])
             
+            if self.connection.in_transaction:
+                await self.connection.commit()
+                logger.debug(f"API calls flushed ({len(pending)})")
+                
         except Exception as e:
-            logger.error(f"Failed to save API call: {e}")
+            logger.error(f"Failed to flush {len(pending)} API calls: {e}")
             await self.connection.rollback()
             raise
     
+    async def _flusher(self) -> None:
+        """Flush queued API calls periodically."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                continue  # Already logged, keep flushing
+    
+    @staticmethod
+    def _utc_now_iso() -> str:
+        """Get current UTC time as naive ISO string (second resolution)."""
+        return datetime.now(timezone.utc).replace(tzinfo=None).isoformat(timespec='seconds')
+    
+    async def _clock(self) -> None:
+        """Refresh the cached timestamp once per second."""
+        while True:
+            self._now_iso = self._utc_now_iso()
+            await asyncio.sleep(1)
+    
     async def _get_or_create_endpoint(self, api_data: Dict[str, Any]) -> int:
         """Get endpoint ID or create new."""
         url = api_data['url']
         method = api_data['method']
         
-        cursor = await self.connection.execute(
-            "SELECT id FROM api_endpoints WHERE url = ? AND method = ?",
-            (url, method)
-        )
+        cursor = await self.connection.execute(self._SQL_SELECT_EP, (url, method))
         row = await cursor.fetchone()
         
         if row:
             return row[0]
         
-        now = datetime.utcnow().isoformat()
-        schema_json = json.dumps(api_data.get('schema', {}))
+        now = self._now_iso
+        schema_json = self._pack(api_data.get('schema', {}))
         
-        cursor = await self.connection.execute("""
-            INSERT INTO api_endpoints (url, method, first_seen, last_seen, schema_json)
-            VALUES (?, ?, ?, ?, ?)
-        """, (url, method, now, now, schema_json))
+        cursor = await self.connection.execute(
+            self._SQL_INSERT_EP, (url, method, now, now, schema_json)
+        )
         
         return cursor.lastrowid
     
-    async def _update_endpoint_stats(self, endpoint_id: int, api_data: Dict[str, Any]) -> None:
-        """Update endpoint statistics."""
-        now = datetime.utcnow().isoformat()
-        response_size = api_data['response_size']
-        
-        await self.connection.execute("""
-            UPDATE api_endpoints 
-            SET 
-                last_seen = ?,
-                call_count = call_count + 1,
-                avg_response_size = (COALESCE(avg_response_size, 0) * (call_count - 1) + ?) / call_count
-            WHERE id = ?
-        """, (now, response_size, endpoint_id))
+    def _pack(self, value: Any) -> bytes:
+        """Serialize value to zstd-compressed JSON."""
+        try:
+            data = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            data = json.dumps(value).encode()  # e.g. integers beyond 64 bits
+        return self._compressor.compress(data)
+    
+    def _unpack(self, data: Any) -> Any:
+        """Deserialize stored JSON (compressed BLOB or legacy TEXT)."""
+        if isinstance(data, bytes):
+            data = self._decompressor.decompress(data)
+        return orjson.loads(data)
+    
+    def _update_endpoint_stats(self, endpoint_id: int, api_data: Dict[str, Any]) -> None:
+        """Accumulate endpoint statistics until the next flush."""
+        rec = self._ep_stats.setdefault(endpoint_id, [0, 0, None])
+        rec[0] += 1
+        rec[1] += api_data['response_size']
+        rec[2] = self._now_iso
     
     async def get_all_endpoints(self) -> List[Dict[str, Any]]:
         """Get all API endpoints."""
-        cursor = await self.connection.execute("""
-            SELECT id, url, method, first_seen, last_seen, call_count, avg_response_size, schema_json
-            FROM api_endpoints
-            ORDER BY call_count DESC
-        """)
+        await self.flush()
+        cursor = await self.connection.execute(self._SQL_ALL_ENDPOINTS)
         rows = await cursor.fetchall()
+        return [self._endpoint_from_row(row) for row in rows]
+    
+    async def iter_all_endpoints(self, batch: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate all API endpoints, fetching batch rows at a time."""
+        async for endpoints in self.iter_endpoint_batches(batch):
+            for endpoint in endpoints:
+                yield endpoint
+    
+    async def iter_endpoint_batches(self, batch: int = 1000) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Iterate all API endpoints as lists of up to batch endpoints."""
+        async for endpoints in self._iter_endpoint_rows(self._SQL_ALL_ENDPOINTS, (), batch):
+            yield endpoints
+    
+    async def iter_endpoints_since(self, last_seen: str, batch: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate endpoints created or updated at or after last_seen (ISO timestamp)."""
+        async for endpoints in self._iter_endpoint_rows(self._SQL_ENDPOINTS_SINCE, (last_seen,), batch):
+            for endpoint in endpoints:
+                yield endpoint
+    
+    async def _iter_endpoint_rows(self, sql: str, params: Tuple, batch: int) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Run endpoint query and yield its rows as lists of endpoint dicts."""
+        await self.flush()
+        cursor = await self.connection.execute(sql, params)
+        try:
+            while rows := await cursor.fetchmany(batch):
+                yield [self._endpoint_from_row(row) for row in rows]
+        finally:
+            await cursor.close()
+    
+    async def search_endpoints(
+        self, query: str, min_calls: int, max_calls: int, limit: int = 20
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Search endpoints by URL substring and call count range; returns (total, top limit by calls)."""
+        await self.flush()
+        where = self._SQL_SEARCH_WHERE
+        params: List[Any] = [min_calls, max_calls]
+        if query and self._fts and len(query) >= 3:
+            # Quoted phrase: trigram substring match, free of FTS5 query syntax
+            where += self._SQL_SEARCH_FTS
+            params.append('"' + query.replace('"', '""') + '"')
+        elif query:
+            # Shorter than one trigram (or no FTS5): scan with LIKE
+            where += self._SQL_SEARCH_URL
+            escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(f"%{escaped}%")
         
-        return [
-            {
-                'id': row[0], 'url': row[1], 'method': row[2],
-                'first_seen': row[3], 'last_seen': row[4],
-                'call_count': row[5], 'avg_response_size': row[6],
-                'schema': json.loads(row[7]) if row[7] else {}
-            }
-            for row in rows
-        ]
+        cursor = await self.connection.execute(f"SELECT COUNT(*) FROM api_endpoints WHERE {where}", params)
+        total = (await cursor.fetchone())[0]
+        
+        cursor = await self.connection.execute(
+            "SELECT id, url, method, first_seen, last_seen, call_count, avg_response_size, schema_json "
+            f"FROM api_endpoints WHERE {where} ORDER BY call_count DESC LIMIT ?",
+            params + [limit]
+        )
+        return total, [self._endpoint_from_row(row) for row in await cursor.fetchall()]
+    
+    def _endpoint_from_row(self, row: Tuple) -> Dict[str, Any]:
+        """Convert api_endpoints row to dict (keys as in ENDPOINT_COLUMNS)."""
+        return {
+            'id': row[0], 'url': row[1], 'method': row[2],
+            'first_seen': row[3], 'last_seen': row[4],
+            'call_count': row[5], 'avg_response_size': row[6],
+            'schema': self._unpack(row[7]) if row[7] else {}
+        }
     
     async def get_stats(self) -> Dict[str, Any]:
         """Get database statistics."""
+        await self.flush()
         cursor = await self.connection.execute("SELECT COUNT(*) FROM api_endpoints")
         total_endpoints = (await cursor.fetchone())[0]
         
@@ -188,6 +455,11 @@ class DatabaseManager:
             'methods': methods
         }
     
+    async def get_data_generation(self) -> int:
+        """Get data generation (PRAGMA user_version), incremented by every clear_all_data."""
+        cursor = await self.connection.execute("PRAGMA user_version")
+        return (await cursor.fetchone())[0]
+    
     async def backup(self) -> str:
         """Create database backup."""
         if not self.config.get('auto_backup', True):
@@ -199,6 +471,7 @@ class DatabaseManager:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         backup_path = os.path.join(backup_dir, f'scraper_backup_{timestamp}.db')
         
+        await self.flush()
         async with aiosqlite.connect(backup_path) as backup_conn:
             await self.connection.backup(backup_conn)
         
@@ -226,20 +499,27 @@ class DatabaseManager:
         Returns:
             True if successful, False otherwise
         """
+        self._pending.clear()
+        self._ep_stats.clear()
+        
         try:
-            # Delete all API calls first (foreign key constraint)
-            await self.connection.execute("DELETE FROM api_calls")
-            
-            # Delete all endpoints
-            await self.connection.execute("DELETE FROM api_endpoints")
+            # Uncommitted endpoint inserts are about to be dropped anyway
+            if self.connection.in_transaction:
+                await self.connection.rollback()
             
-            # Delete all sessions
-            await self.connection.execute("DELETE FROM crawl_sessions")
+            # Dropping frees whole pages instead of deleting row by row,
+            # and also removes the tables' sqlite_sequence entries
+            await self.connection.execute("BEGIN")
+            # Bump the generation so other readers notice the clear
+            generation = await self.get_data_generation()
+            await self.connection.execute(f"PRAGMA user_version = {generation + 1}")
+            await self.connection.execute("DROP TABLE IF EXISTS endpoints_fts")
+            await self.connection.execute("DROP TABLE IF EXISTS api_calls")
+            await self.connection.execute("DROP TABLE IF EXISTS api_endpoints")
+            await self.connection.execute("DROP TABLE IF EXISTS crawl_sessions")
             
-            # Reset autoincrement
-            await self.connection.execute("DELETE FROM sqlite_sequence WHERE name IN ('api_calls', 'api_endpoints', 'crawl_sessions')")
-            
-            await self.connection.commit()
+            # Recreate tables and indexes, committing the transaction
+            await self._create_tables()
             
             logger.info("All data cleared from database")
             return True
@@ -251,7 +531,17 @@ class DatabaseManager:
     
     async def close(self) -> None:
         """Close database connection."""
+        for task in (self._clock_task, self._flush_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._clock_task = self._flush_task = None
+        
         if self.connection:
+            await self.flush()
             await self.connection.close()
             logger.debug("Database closed")
     
@@ -6,12 +6,31 @@ Captures and analyzes network traffic to identify API calls.
 """
 
 from playwright.async_api import Page, Response, Request
-from typing import Dict, Any, List, Callable, Optional
+from typing import Deque, Dict, Any, List, Callable, Optional, Set
 from loguru import logger
+import asyncio
 import json
+import orjson
 import re
+from collections import Counter, deque
 from datetime import datetime
-from urllib.parse import urlparse
+from itertools import islice
+from urllib.parse import urlsplit
+
+# URL markers of API endpoints ('/api/', '/v1/'-'/v3/', '/graphql', '/rest/')
+_API_URL_PATTERN = r'(?i:/(?:api/|v[123]/|graphql|rest/))'
+
+# Integers of 19+ digits may not fit 64 bits; orjson would turn them into lossy floats
+_LONG_DIGITS = re.compile(rb'\d{19}')
+
+# JSON type names keyed by exact Python type (bool must not fall through to int)
+_LEAF_TYPES = {
+    str: 'string',
+    int: 'integer',
+    float: 'number',
+    bool: 'boolean',
+    type(None): 'null',
+}
 
 
 class NetworkInterceptor:
@@ -19,11 +38,30 @@ class NetworkInterceptor:
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.captured_apis: List[Dict[str, Any]] = []
         self.api_detection = config.get('api_detection', {})
+        # Bounded history; bodies are only retained on request (callbacks always get them)
+        self.keep_bodies = self.api_detection.get('keep_bodies', False)
+        self.captured_apis: Deque[Dict[str, Any]] = deque(
+            maxlen=self.api_detection.get('max_captured', 10_000)
+        )
         self.ignore_patterns = self.api_detection.get('ignore_patterns', [])
+        self._url_re = self._build_url_classifier(self.ignore_patterns)
         self.content_types = self.api_detection.get('content_types', [])
+        self._content_types = tuple(ct.lower() for ct in self.content_types)
+        self.schema_max_keys = self.api_detection.get('schema_max_keys', 100)
+        self.min_json_size = self.api_detection.get('min_json_size', 50)
         self._callbacks: List[Callable] = []
+        # Batch callbacks receive captured calls in groups of up to batch_size, at most batch_delay apart
+        self._batch_callbacks: List[Callable] = []
+        self._batch: List[Dict[str, Any]] = []
+        self._batch_task: Optional[asyncio.Task] = None
+        self._batch_lock = asyncio.Lock()
+        self.batch_delay = self.api_detection.get('batch_delay', 250) / 1000
+        self.batch_size = self.api_detection.get('batch_size', 200)
+        # Running capture statistics, updated as APIs are captured
+        self._methods: Counter = Counter()
+        self._status_codes: Counter = Counter()
+        self._endpoints: Set[str] = set()
         
     async def attach(self, page: Page) -> None:
         """Attach interceptor to page."""
@@ -36,157 +74,220 @@ class NetworkInterceptor:
         """Handle response and identify API calls."""
         try:
             url = response.url
-            if self._should_ignore(url) or not await self._is_api_response(response):
+            url_kind = self._classify_url(url)
+            if url_kind == 'ignore':
+                return
+            
+            # Playwright builds a new dict on every .headers access; fetch it once
+            headers = response.headers
+            if not self._is_api_response(headers, url_kind == 'api'):
                 return
             
-            api_data = await self._extract_api_data(response)
+            api_data = await self._extract_api_data(response, headers)
             if api_data:
-                self.captured_apis.append(api_data)
-                logger.info(f"API found: {url} [{response.status}]")
+                self._record(api_data)
+                logger.info("API found: {} [{}]", url, response.status)
                 await self._trigger_callbacks(api_data)
+                self._queue_batch(api_data)
                 
         except Exception as e:
-            logger.debug(f"Response handling failed: {e}")
+            logger.debug("Response handling failed: {}", e)
     
     async def _handle_request(self, request: Request) -> None:
         """Handle request to extract auth headers."""
         try:
-            headers = request.headers
-            if 'authorization' in [h.lower() for h in headers.keys()]:
-                logger.debug(f"Authorization header found: {request.url}")
+            # Playwright already lowercases header names
+            if 'authorization' in request.headers:
+                logger.debug("Authorization header found: {}", request.url)
         except Exception as e:
-            logger.debug(f"Request handling failed: {e}")
+            logger.debug("Request handling failed: {}", e)
     
-    def _should_ignore(self, url: str) -> bool:
-        """Check if URL should be ignored."""
-        return any(re.match(pattern, url) for pattern in self.ignore_patterns)
+    def _record(self, api_data: Dict[str, Any]) -> None:
+        """Store captured API call and update running statistics."""
+        if self.keep_bodies:
+            self.captured_apis.append(api_data)
+        else:
+            self.captured_apis.append({k: v for k, v in api_data.items() if k != 'response_body'})
+        self._methods[api_data['method']] += 1
+        self._status_codes[api_data['status']] += 1
+        self._endpoints.add(api_data['base_url'])
+    
+    @staticmethod
+    def _build_url_classifier(ignore_patterns: List[str]) -> re.Pattern:
+        """Fuse ignore patterns and API URL markers into one regex."""
+        # Ignore patterns are anchored at the start (re.match semantics) and tried first,
+        # so any ignore match wins; otherwise the first API marker found names the URL
+        alternatives = []
+        if ignore_patterns:
+            fused = '|'.join(f'(?:{pattern})' for pattern in ignore_patterns)
+            alternatives.append(rf'(?P<ignore>\A(?:{fused}))')
+        alternatives.append(f'(?P<api>{_API_URL_PATTERN})')
+        return re.compile('|'.join(alternatives))
     
-    async def _is_api_response(self, response: Response) -> bool:
+    def _classify_url(self, url: str) -> Optional[str]:
+        """Classify URL as 'ignore', 'api' or None in a single scan."""
+        match = self._url_re.search(url)
+        return match.lastgroup if match else None
+    
+    def _is_api_response(self, headers: Dict[str, str], is_api_url: bool) -> bool:
         """Identify if response is an API call."""
-        try:
-            content_type = response.headers.get('content-type', '').lower()
-            if any(ct in content_type for ct in self.content_types):
-                return True
-            
-            url = response.url.lower()
-            api_patterns = ['/api/', '/v1/', '/v2/', '/v3/', '/graphql', '/rest/']
-            return any(pattern in url for pattern in api_patterns)
-            
-        except Exception:
-            return False
+        content_type = headers.get('content-type', '').lower()
+        if any(ct in content_type for ct in self._content_types):
+            return True
+        
+        return is_api_url
+    
+    @staticmethod
+    def _parse_json(body: bytes) -> Any:
+        """Parse JSON body exactly as json.loads would (ValueError if invalid)."""
+        if not _LONG_DIGITS.search(body):
+            try:
+                # Parses (and UTF-8 validates) the bytes without an intermediate str
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass  # e.g. NaN or Infinity, which json.loads accepts
+        
+        return json.loads(body)
     
-    async def _extract_api_data(self, response: Response) -> Optional[Dict[str, Any]]:
+    async def _extract_api_data(self, response: Response, headers: Dict[str, str]) -> Optional[Dict[str, Any]]:
         """Extract API data from response."""
         try:
             body = await response.body()
-            min_size = self.api_detection.get('min_json_size', 50)
-            if len(body) < min_size:
+            if len(body) < self.min_json_size:
                 return None
             
             try:
-                json_data = json.loads(body.decode('utf-8'))
-            except (json.JSONDecodeError, UnicodeDecodeError):
+                json_data = self._parse_json(body)
+            except ValueError:
                 return None
             
+            url = response.url
+            parsed = urlsplit(url)
+            request = response.request
+            
             return {
                 'timestamp': datetime.utcnow().isoformat(),
-                'url': response.url,
-                'method': response.request.method,
+                'url': url,
+                'base_url': f"{parsed.scheme}://{parsed.netloc}{parsed.path}",
+                'method': request.method,
                 'status': response.status,
-                'headers': dict(response.headers),
-                'request_headers': dict(response.request.headers),
+                'headers': headers,
+                'request_headers': request.headers,
                 'response_body': json_data,
                 'response_size': len(body),
-                'content_type': response.headers.get('content-type', ''),
+                'content_type': headers.get('content-type', ''),
                 'schema': self._infer_schema(json_data)
             }
             
         except Exception as e:
-            logger.debug(f"API data extraction failed: {e}")
+            logger.debug("API data extraction failed: {}", e)
             return None
     
-    def _infer_schema(self, data: Any, max_depth: int = 3, current_depth: int = 0) -> Dict[str, Any]:
-        """Infer JSON data schema."""
-        if current_depth >= max_depth:
-            return {'type': 'truncated'}
+    def _infer_schema(self, data: Any, max_depth: int = 3) -> Dict[str, Any]:
+        """Infer JSON data schema (iterative, sampling at most schema_max_keys keys per object)."""
+        schema: Dict[str, Any] = {}
+        # Each entry fills its pre-linked output slot, avoiding a call frame per node
+        stack = [(data, 0, schema)]
         
-        if isinstance(data, dict):
-            return {
-                'type': 'object',
-                'properties': {
-                    key: self._infer_schema(value, max_depth, current_depth + 1)
-                    for key, value in data.items()
-                }
-            }
-        elif isinstance(data, list):
-            if not data:
-                return {'type': 'array', 'items': {'type': 'unknown'}}
-            return {
-                'type': 'array',
-                'items': self._infer_schema(data[0], max_depth, current_depth + 1),
-                'length': len(data)
-            }
-        elif isinstance(data, str):
-            return {'type': 'string'}
-        elif isinstance(data, int):
-            return {'type': 'integer'}
-        elif isinstance(data, float):
-            return {'type': 'number'}
-        elif isinstance(data, bool):
-            return {'type': 'boolean'}
-        elif data is None:
-            return {'type': 'null'}
-        else:
-            return {'type': 'unknown'}
+        while stack:
+            value, depth, out = stack.pop()
+            kind = type(value)
+            
+            if depth >= max_depth:
+                out['type'] = 'truncated'
+            elif kind is dict:
+                properties = {}
+                out['type'] = 'object'
+                out['properties'] = properties
+                for key in islice(value, self.schema_max_keys):
+                    properties[key] = slot = {}
+                    stack.append((value[key], depth + 1, slot))
+            elif kind is list:
+                out['type'] = 'array'
+                if not value:
+                    out['items'] = {'type': 'unknown'}
+                else:
+                    out['items'] = slot = {}
+                    out['length'] = len(value)
+                    stack.append((value[0], depth + 1, slot))
+            else:
+                out['type'] = _LEAF_TYPES.get(kind, 'unknown')
+        
+        return schema
     
     def add_callback(self, callback: Callable) -> None:
         """Add callback for API discovery."""
         self._callbacks.append(callback)
-        logger.debug(f"Callback added (total: {len(self._callbacks)})")
+        logger.debug("Callback added (total: {})", len(self._callbacks))
     
     async def _trigger_callbacks(self, api_data: Dict[str, Any]) -> None:
-        """Trigger all registered callbacks."""
-        for callback in self._callbacks:
-            try:
-                await callback(api_data)
-            except Exception as e:
-                logger.error(f"Callback error: {e}")
+        """Trigger all registered callbacks concurrently."""
+        results = await asyncio.gather(
+            *(callback(api_data) for callback in self._callbacks),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Callback error: {}", result)
+    
+    def add_batch_callback(self, callback: Callable) -> None:
+        """Add callback receiving lists of discovered API calls."""
+        self._batch_callbacks.append(callback)
+        logger.debug("Batch callback added (total: {})", len(self._batch_callbacks))
+    
+    def _queue_batch(self, api_data: Dict[str, Any]) -> None:
+        """Buffer API call for batch callbacks, flushing when full or after a delay."""
+        if not self._batch_callbacks:
+            return
+        self._batch.append(api_data)
+        if len(self._batch) == self.batch_size:
+            # Full batch: deliver now; a pending delayed flush picks up whatever follows
+            self._batch_task = asyncio.create_task(self.flush())
+        elif self._batch_task is None or self._batch_task.done():
+            self._batch_task = asyncio.create_task(self._delayed_flush())
+    
+    async def _delayed_flush(self) -> None:
+        """Flush buffered API calls after batch_delay."""
+        await asyncio.sleep(self.batch_delay)
+        await self.flush()
+    
+    async def flush(self) -> None:
+        """Deliver buffered API calls to batch callbacks."""
+        # The lock makes a final flush wait for any delivery already in flight
+        async with self._batch_lock:
+            batch, self._batch = self._batch, []
+            if not batch:
+                return
+            
+            results = await asyncio.gather(
+                *(callback(batch) for callback in self._batch_callbacks),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error("Batch callback error: {}", result)
     
     def get_captured_apis(self) -> List[Dict[str, Any]]:
         """Get all captured API calls."""
-        return self.captured_apis
+        return list(self.captured_apis)
     
     def get_unique_endpoints(self) -> List[str]:
         """Get unique API endpoint URLs."""
-        endpoints = set()
-        for api in self.captured_apis:
-            parsed = urlparse(api['url'])
-            base_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-            endpoints.add(base_url)
-        return sorted(list(endpoints))
+        return sorted(self._endpoints)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get capture statistics."""
-        total = len(self.captured_apis)
-        unique_endpoints = len(self.get_unique_endpoints())
-        
-        methods = {}
-        status_codes = {}
-        
-        for api in self.captured_apis:
-            method = api['method']
-            methods[method] = methods.get(method, 0) + 1
-            status = api['status']
-            status_codes[status] = status_codes.get(status, 0) + 1
-        
         return {
-            'total_apis': total,
-            'unique_endpoints': unique_endpoints,
-            'methods': methods,
-            'status_codes': status_codes,
+            'total_apis': sum(self._methods.values()),  # Includes calls evicted from history
+            'unique_endpoints': len(self._endpoints),
+            'methods': dict(self._methods),
+            'status_codes': dict(self._status_codes),
         }
     
     def clear(self) -> None:
         """Clear captured APIs."""
         self.captured_apis.clear()
+        self._methods.clear()
+        self._status_codes.clear()
+        self._endpoints.clear()
         logger.debug("Captured APIs cleared")
@@ -6,7 +6,7 @@ Professional web interface for managing and monitoring API scraping.
 """
 
 import streamlit as st
-import asyncio
+import functools
 import sys
 from pathlib import Path
 import time
@@ -56,19 +56,65 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Session state
-if 'scraping_process' not in st.session_state:
-    st.session_state.scraping_process = None
+if 'scraping_task' not in st.session_state:
+    st.session_state.scraping_task = None
 if 'config' not in st.session_state:
     st.session_state.config = None
+if 'endpoint_cache' not in st.session_state:
+    st.session_state.endpoint_cache = None
 
 
-async def get_database_data(config: dict):
-    """Fetch data from database."""
-    db_config = config.get('database', {})
-    async with DatabaseManager(db_config) as db:
-        stats = await db.get_stats()
-        all_endpoints = await db.get_all_endpoints()
-        return stats, all_endpoints
+def db_config_key(config: dict) -> tuple:
+    """Get hashable key of the database config section."""
+    return tuple(sorted(config.get('database', {}).items()))
+
+
+async def get_database_data(db: DatabaseManager, since: str):
+    """Fetch data generation, stats and the endpoints changed at or after since."""
+    generation = await db.get_data_generation()
+    stats = await db.get_stats()
+    changed = [endpoint async for endpoint in db.iter_endpoints_since(since)]
+    return generation, stats, changed
+
+
+def load_database_data(db_config_items: tuple):
+    """Fetch data from database, incrementally on top of this session's endpoint cache."""
+    db = dash_utils.get_database(db_config_items)
+    cache = st.session_state.endpoint_cache or {'rows': {}, 'since': '', 'list': [], 'generation': None}
+    generation, stats, changed = dash_utils.run_sync(get_database_data(db, cache['since']))
+    
+    # A new generation means the data was cleared (possibly by another session);
+    # fewer endpoints than cached catches a database replaced on disk
+    if cache['rows'] and (generation != cache['generation'] or stats['total_endpoints'] < len(cache['rows'])):
+        cache = {'rows': {}, 'since': '', 'list': [], 'generation': None}
+        generation, stats, changed = dash_utils.run_sync(get_database_data(db, ''))
+    cache['generation'] = generation
+    
+    rows = cache['rows']
+    updated = False
+    for endpoint in changed:
+        # Rows from the last-seen second itself come back again, usually unchanged
+        if rows.get(endpoint['id']) != endpoint:
+            rows[endpoint['id']] = endpoint
+            updated = True
+        cache['since'] = max(cache['since'], endpoint['last_seen'])
+    
+    # Keep the same list object while nothing changed, so per-dataset work can key on it
+    if updated:
+        cache['list'] = sorted(rows.values(), key=lambda ep: ep['call_count'], reverse=True)
+    st.session_state.endpoint_cache = cache
+    return stats, cache['list']
+
+
+def reset_endpoint_cache():
+    """Drop this session's endpoint cache so the next load reads everything."""
+    st.session_state.endpoint_cache = None
+
+
+def search_database(db_config_items: tuple, query: str, min_calls: int, max_calls: int, limit: int = 20):
+    """Search endpoints in the database; returns (total matches, first limit endpoints)."""
+    db = dash_utils.get_database(db_config_items)
+    return dash_utils.run_sync(db.search_endpoints(query, min_calls, max_calls, limit))
 
 
 def render_sidebar(config: dict, is_scraping: bool):
@@ -93,7 +139,7 @@ def render_sidebar(config: dict, is_scraping: bool):
         st.markdown("---")
         
         # Quick actions
-        _render_quick_actions()
+        _render_quick_actions(config)
 
 
 def _render_run_tab(config: dict, is_scraping: bool):
@@ -119,25 +165,24 @@ def _render_run_tab(config: dict, is_scraping: bool):
             config.get('scraping', {}).get('headless', True)
         )
     
-    st.info("Scraping runs in separate console window")
+    st.info("Scraping runs in the background (progress in the server console)")
     
     if st.button("Start Scraping", disabled=is_scraping, width="stretch", type="primary"):
         config['scraping']['max_depth'] = max_depth
         config['scraping']['headless'] = headless
         save_yaml_config(config)
         
-        process = dash_utils.start_scraping_process(target_url, config, max_depth, headless)
-        if process:
-            st.session_state.scraping_process = process
+        task = dash_utils.start_scraping_task(target_url, config, max_depth, headless)
+        if task:
+            st.session_state.scraping_task = task
             st.success("Scraping started!")
-            st.info("Check console window")
             time.sleep(1)
             st.rerun()
     
     if st.button("Stop", disabled=not is_scraping, width="stretch"):
-        if st.session_state.scraping_process:
-            st.session_state.scraping_process.terminate()
-            st.session_state.scraping_process = None
+        if st.session_state.scraping_task:
+            st.session_state.scraping_task.cancel()
+            st.session_state.scraping_task = None
             st.warning("Stopped")
             st.rerun()
 
@@ -192,25 +237,27 @@ def _render_status_tab(is_scraping: bool):
     
     st.markdown("---")
     if st.button("🔄 Refresh Data", width="stretch"):
+        reset_endpoint_cache()
         st.rerun()
 
 
-def _render_quick_actions():
+def _render_quick_actions(config: dict):
     """Render quick action buttons."""
     st.subheader("Quick Actions")
     
     if st.button("🔄 Refresh Dashboard", width="stretch", type="primary"):
+        reset_endpoint_cache()
         st.rerun()
     
     st.markdown("---")
     st.caption("Export Data:")
     
     if st.button("📥 Export JSON", width="stretch"):
-        if dash_utils.export_data("json"):
+        if dash_utils.export_data(dash_utils.get_database(db_config_key(config)), "json"):
             st.success("Export started! Check exports/ folder")
     
     if st.button("📄 Export CSV", width="stretch"):
-        if dash_utils.export_data("csv"):
+        if dash_utils.export_data(dash_utils.get_database(db_config_key(config)), "csv"):
             st.success("Export started! Check exports/ folder")
     
     st.markdown("---")
@@ -228,7 +275,8 @@ def _render_quick_actions():
         col1, col2 = st.columns(2)
         with col1:
             if st.button("✅ Confirm", width="stretch", type="primary"):
-                if dash_utils.clear_database():
+                if dash_utils.clear_database(dash_utils.get_database(db_config_key(config))):
+                    reset_endpoint_cache()
                     st.session_state.confirm_clear = False
                     st.success("All data cleared!")
                     time.sleep(1)
@@ -272,19 +320,25 @@ def main():
     
     config = st.session_state.config
     
-    # Check process status
-    if st.session_state.scraping_process is not None:
-        if st.session_state.scraping_process.poll() is not None:
-            st.session_state.scraping_process = None
+    # Check scraping task status
+    task = st.session_state.scraping_task
+    if task is not None and task.done():
+        st.session_state.scraping_task = None
+        if not task.cancelled():
+            # Reload everything the scrape wrote on this rerun
+            reset_endpoint_cache()
+            if task.exception() is not None:
+                st.error(f"Scraping failed: {task.exception()}")
     
-    is_scraping = st.session_state.scraping_process is not None
+    is_scraping = st.session_state.scraping_task is not None
     
     # Sidebar
     render_sidebar(config, is_scraping)
     
     # Main content
+    db_config_items = db_config_key(config)
     try:
-        stats, all_endpoints = asyncio.run(get_database_data(config))
+        stats, all_endpoints = load_database_data(db_config_items)
     except Exception as e:
         st.error(f"❌ Database Error: {e}")
         st.info("💡 Run scraping first to see data")
@@ -322,7 +376,7 @@ python main.py scrape https://jsonplaceholder.typicode.com
         analytics.render(all_endpoints)
     
     with tab4:
-        search.render(all_endpoints)
+        search.render(functools.partial(search_database, db_config_items))
     
     with tab5:
         config_editor.render(config)
@@ -7,7 +7,13 @@ Endpoints browser with filtering and export.
 
 import streamlit as st
 import pandas as pd
-import json
+import numpy as np
+import orjson
+import csv
+import io
+from operator import itemgetter
+
+from core.database import ENDPOINT_COLUMNS
 
 
 def render(endpoints: list):
@@ -43,14 +49,18 @@ def _apply_filters(endpoints: list) -> list:
     with col3:
         search_term = st.text_input("Search URL:", placeholder="e.g., /api/users")
     
-    # Filter
-    filtered = endpoints
-    
-    if selected_method != 'All':
-        filtered = [ep for ep in filtered if ep['method'] == selected_method]
+    # Filter (both predicates in one pass)
+    method = None if selected_method == 'All' else selected_method
+    term = search_term.lower() if search_term else None
     
-    if search_term:
-        filtered = [ep for ep in filtered if search_term.lower() in ep['url'].lower()]
+    if method is None and term is None:
+        filtered = endpoints
+    else:
+        filtered = [
+            ep for ep in endpoints
+            if (method is None or ep['method'] == method)
+            and (term is None or term in ep['url'].lower())
+        ]
     
     # Sort
     if sort_by == "Calls (Most)":
@@ -69,15 +79,19 @@ def _render_table(filtered: list, total: int):
     """Render endpoints table."""
     st.info(f"Showing {len(filtered)} of {total} endpoints")
     
-    df = pd.DataFrame([{
-        'ID': ep['id'],
-        'Method': ep['method'],
-        'URL': ep['url'],
-        'Calls': ep['call_count'],
-        'Size (KB)': round((ep.get('avg_response_size') or 0) / 1024, 2),
-        'First Seen': ep['first_seen'][:19],
-        'Last Seen': ep['last_seen'][:19],
-    } for ep in filtered])
+    count = len(filtered)
+    sizes = np.fromiter((ep.get('avg_response_size') or 0 for ep in filtered), dtype=np.float64, count=count)
+    
+    # Column-oriented construction; numeric columns go straight into numpy buffers
+    df = pd.DataFrame({
+        'ID': [ep['id'] for ep in filtered],
+        'Method': [ep['method'] for ep in filtered],
+        'URL': [ep['url'] for ep in filtered],
+        'Calls': np.fromiter((ep['call_count'] for ep in filtered), dtype=np.int64, count=count),
+        'Size (KB)': np.round(sizes / 1024, 2),
+        'First Seen': [ep['first_seen'][:19] for ep in filtered],
+        'Last Seen': [ep['last_seen'][:19] for ep in filtered],
+    })
     
     st.dataframe(df, width="stretch", hide_index=True)
 
@@ -87,18 +101,16 @@ def _render_export_buttons(filtered: list):
     col1, col2 = st.columns(2)
     
     with col1:
-        df = pd.DataFrame(filtered)
-        csv = df.to_csv(index=False)
         st.download_button(
             "Download CSV",
-            csv,
+            _to_csv(filtered),
             "endpoints.csv",
             "text/csv",
             width="stretch"
         )
     
     with col2:
-        json_data = json.dumps(filtered, indent=2)
+        json_data = orjson.dumps(filtered, option=orjson.OPT_INDENT_2)
         st.download_button(
             "Download JSON",
             json_data,
@@ -106,3 +118,12 @@ def _render_export_buttons(filtered: list):
             "application/json",
             width="stretch"
         )
+
+
+def _to_csv(filtered: list) -> str:
+    """Serialize endpoints to CSV without building a DataFrame."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(ENDPOINT_COLUMNS)
+    writer.writerows(map(itemgetter(*ENDPOINT_COLUMNS), filtered))
+    return buffer.getvalue()
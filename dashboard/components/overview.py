@@ -5,6 +5,7 @@ Overview Component
 Dashboard overview tab with summary statistics and charts.
 """
 
+import heapq
 import streamlit as st
 import plotly.express as px
 import pandas as pd
@@ -59,7 +60,7 @@ def _render_top_endpoints_chart(endpoints: list):
     
     st.subheader("Top 5 Endpoints")
     
-    top_5 = sorted(endpoints, key=lambda x: x['call_count'], reverse=True)[:5]
+    top_5 = heapq.nlargest(5, endpoints, key=lambda x: x['call_count'])
     
     top_df = pd.DataFrame([
         {'Endpoint': ep['url'][:40] + '...', 'Calls': ep['call_count']} 
@@ -83,7 +84,7 @@ def _render_recent_table(endpoints: list):
     """Render recently discovered endpoints table."""
     st.subheader("Recently Discovered")
     
-    recent = sorted(endpoints, key=lambda x: x['last_seen'], reverse=True)[:10]
+    recent = heapq.nlargest(10, endpoints, key=lambda x: x['last_seen'])
     
     df = pd.DataFrame([{
         'Method': ep['method'],
@@ -6,10 +6,14 @@ Advanced endpoint search.
 """
 
 import streamlit as st
+from itertools import islice
 
+# Results shown per search
+RESULT_LIMIT = 20
 
-def render(endpoints: list):
-    """Render search tab."""
+
+def render(search_fn):
+    """Render search tab (search_fn(query, min_calls, max_calls, limit) runs the query in the database)."""
     st.header("Advanced Search")
     
     # Search inputs
@@ -21,29 +25,19 @@ def render(endpoints: list):
     with col2:
         max_calls = st.number_input("Max Calls", 0, value=1000000)
     
-    # Perform search
+    # Perform search; filtering, ordering and the limit are pushed down to SQL
     if search_query or (min_calls > 0 or max_calls < 1000000):
-        results = _search_endpoints(endpoints, search_query, min_calls, max_calls)
-        _display_results(results)
-
-
-def _search_endpoints(endpoints: list, query: str, min_calls: int, max_calls: int) -> list:
-    """Search and filter endpoints."""
-    results = endpoints
-    
-    if query:
-        results = [ep for ep in results if query.lower() in ep['url'].lower()]
-    
-    results = [ep for ep in results if min_calls <= ep['call_count'] <= max_calls]
-    
-    return results
+        total, results = search_fn(search_query, min_calls, max_calls, RESULT_LIMIT)
+        _display_results(results, total)
 
 
-def _display_results(results: list):
-    """Display search results."""
-    st.subheader(f"Found {len(results)} results")
+def _display_results(results, total: int):
+    """Display search results (results may be any iterable; at most RESULT_LIMIT are consumed)."""
+    st.subheader(f"Found {total} results")
     
-    for ep in results[:20]:
+    shown = 0
+    for ep in islice(results, RESULT_LIMIT):
+        shown += 1
         with st.expander(f"{ep['method']} {ep['url']}"):
             col1, col2 = st.columns(2)
             
@@ -62,5 +56,5 @@ def _display_results(results: list):
                 else:
                     st.info("No schema available")
     
-    if len(results) > 20:
-        st.info(f"Showing first 20 of {len(results)} results")
+    if total > shown:
+        st.info(f"Showing first {shown} of {total} results")
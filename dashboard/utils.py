@@ -5,104 +5,159 @@ Dashboard Utilities
 Helper functions for dashboard operations.
 """
 
-import subprocess
-import sys
+import asyncio
+import copy
 import os
+import sys
+import threading
+from concurrent.futures import Future
+from typing import Coroutine, Dict, Optional
+
 import streamlit as st
+from loguru import logger
+
+sys.path.insert(0, str(os.path.dirname(os.path.dirname(__file__))))
+
+from core.database import DatabaseManager
+
+# Background event loop shared by all sessions; lives as long as the server
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
 
+# Open databases shared by all sessions, keyed by database config items
+_databases: Dict[tuple, DatabaseManager] = {}
+_databases_lock = threading.Lock()
 
-def run_cli_command(command: list, show_window: bool = True):
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
     """
-    Run CLI command in subprocess.
+    Get the dashboard's background event loop, starting it on first use.
+    
+    Returns:
+        Event loop running forever on a daemon thread
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="dashboard-loop", daemon=True).start()
+    return _loop
+
+
+def run_in_background(coro: Coroutine) -> Future:
+    """
+    Schedule coroutine on the background loop.
     
     Args:
-        command: Command as list [python, main.py, ...]
-        show_window: Show console window on Windows
+        coro: Coroutine to run
+    
+    Returns:
+        Future for polling (done()), cancelling (cancel()) or waiting (result())
     """
-    try:
-        if os.name == 'nt' and show_window:
-            # Windows - show console window
-            subprocess.Popen(
-                command,
-                creationflags=subprocess.CREATE_NEW_CONSOLE,
-                cwd=os.getcwd()
-            )
-        else:
-            # Unix or background
-            subprocess.Popen(command, cwd=os.getcwd())
-        return True
-    except Exception as e:
-        st.error(f"Command failed: {e}")
-        return False
+    future = asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def run_sync(coro: Coroutine):
+    """
+    Run coroutine on the background loop and wait for its result.
+    
+    Args:
+        coro: Coroutine to run
+    
+    Returns:
+        Coroutine result (exceptions are re-raised)
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_background_loop()).result()
 
 
-def start_scraping_process(url: str, config: dict, depth: int, headless: bool):
+def get_database(db_config_items: tuple) -> DatabaseManager:
     """
-    Start scraping in new process.
+    Get the open database for a config, shared by all sessions.
+    
+    Args:
+        db_config_items: Sorted items of the database config section
+    
+    Returns:
+        Database opened on the background loop on first use (lives as long as the server)
+    """
+    with _databases_lock:
+        db = _databases.get(db_config_items)
+        if db is None:
+            db = DatabaseManager(dict(db_config_items))
+            run_sync(db.initialize())
+            _databases[db_config_items] = db
+    return db
+
+
+def _log_failure(future: Future) -> None:
+    """Log exceptions of background tasks nobody waits on."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"Background task failed: {future.exception()}")
+
+
+def start_scraping_task(url: str, config: dict, depth: int, headless: bool) -> Optional[Future]:
+    """
+    Start scraping in the background loop.
     
     Args:
         url: Target URL
         config: Configuration dict
         depth: Max crawl depth
         headless: Run headless browser
-        
+    
     Returns:
-        Process object or None
+        Future of the running scrape or None
     """
-    cmd = [sys.executable, "main.py", "scrape", url, "--depth", str(depth)]
+    from main import run_scraper
     
-    if not headless:
-        cmd.append("--no-headless")
+    # Depth and headless are overridden per run; keep the session's copy untouched
+    cfg = copy.deepcopy(config)
+    cfg.setdefault('scraping', {})['max_depth'] = depth
+    cfg['scraping']['headless'] = headless
     
     try:
-        if os.name == 'nt':
-            process = subprocess.Popen(
-                cmd,
-                creationflags=subprocess.CREATE_NEW_CONSOLE,
-                cwd=os.getcwd()
-            )
-        else:
-            process = subprocess.Popen(cmd, cwd=os.getcwd())
-        return process
+        return run_in_background(run_scraper(url, cfg))
     except Exception as e:
         st.error(f"Failed to start scraping: {e}")
         return None
 
 
-def export_data(format: str = "json"):
+def export_data(db: DatabaseManager, format: str = "json") -> Optional[Future]:
     """
     Export data to file.
     
     Args:
+        db: Open database (e.g. from get_database, served by the background loop)
         format: Export format (json or csv)
+    
+    Returns:
+        Future of the running export or None
     """
+    from main import export_data as export_to_file
+    
     output_file = f"exports/export.{format}"
-    cmd = [sys.executable, "main.py", "export", "--format", format, "--output", output_file]
-    return run_cli_command(cmd, show_window=True)
+    try:
+        os.makedirs("exports", exist_ok=True)
+        return run_in_background(export_to_file(db, output_file, format))
+    except Exception as e:
+        st.error(f"Export failed: {e}")
+        return None
 
 
-def clear_database():
+def clear_database(db: DatabaseManager):
     """
     Clear all data from database.
     
+    Args:
+        db: Open database (e.g. from get_database, served by the background loop)
+    
     Returns:
         True if successful
     """
-    import asyncio
-    sys.path.insert(0, str(os.path.dirname(os.path.dirname(__file__))))
-    from core.database import DatabaseManager
-    from utils.helpers import load_yaml_config
-    
     try:
-        config = load_yaml_config()
-        db_config = config.get('database', {})
-        
-        async def _clear():
-            async with DatabaseManager(db_config) as db:
-                return await db.clear_all_data()
-        
-        result = asyncio.run(_clear())
-        return result
+        return run_sync(db.clear_all_data())
     except Exception as e:
         st.error(f"Failed to clear database: {e}")
         return False
@@ -6,21 +6,22 @@ Demonstrates core functionality of API Scraper Pro.
 """
 
 import asyncio
-import yaml
 from core.browser import StealthBrowser
 from core.crawler import SmartCrawler
 from core.interceptor import NetworkInterceptor
 from core.database import DatabaseManager
-from utils.robots import RobotsParser
+from utils.robots import RobotsParser, close_shared_client
 from utils.normalization import DataNormalizer
+from utils.helpers import load_yaml_config, install_uvloop
 
 
 async def main():
     """Main function."""
     
     # Load config
-    with open('config/default.yaml', 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_config('config/default.yaml')
+    scraping_config = config.get('scraping', {})
+    page_delay = scraping_config.get('page_delay', 2000) / 1000
     
     # Target URL
     target_url = "https://jsonplaceholder.typicode.com"
@@ -31,6 +32,7 @@ async def main():
     # Check robots.txt
     robots = RobotsParser(respect_robots=config.get('compliance', {}).get('respect_robots_txt', True))
     await robots.load(target_url)
+    await close_shared_client()  # Single load; release its connection
     
     if not robots.is_allowed(target_url):
         print("❌ Blocked by robots.txt!")
@@ -41,66 +43,69 @@ async def main():
     
     # Start scraping
     async with (
-        StealthBrowser(config.get('scraping', {})) as browser,
+        StealthBrowser(scraping_config) as browser,
         DatabaseManager(config.get('database', {})) as db
     ):
-        crawler = SmartCrawler(config.get('scraping', {}))
+        crawler = SmartCrawler(scraping_config)
         interceptor = NetworkInterceptor(config)
         
-        # Callback to save and anonymize API calls
-        async def save_and_anonymize(api_data):
-            # Anonymize PII
-            api_data['response_body'] = normalizer.anonymize(api_data['response_body'])
-            
-            # Detect PII (for logging)
-            pii_found = normalizer.detect_pii(api_data['response_body'])
-            if pii_found:
-                print(f"🔒 PII detected and anonymized: {pii_found}")
+        # Batch callback to anonymize and save API calls (one transaction per batch)
+        async def save_and_anonymize(api_calls):
+            # Anonymize PII (one scanner pass for the whole batch)
+            bodies = normalizer.anonymize_batch([api_data['response_body'] for api_data in api_calls])
+            for api_data, body in zip(api_calls, bodies):
+                api_data['response_body'] = body
+                
+                # Detect PII (for logging)
+                pii_found = normalizer.detect_pii(api_data['response_body'])
+                if pii_found:
+                    print(f"🔒 PII detected and anonymized: {pii_found}")
             
             # Save to database
-            await db.save_api_call(api_data)
-            print(f"💾 API saved: {api_data['method']} {api_data['url']}")
+            await db.save_api_calls_batch(api_calls)
+            for api_data in api_calls:
+                print(f"💾 API saved: {api_data['method']} {api_data['url']}")
         
-        interceptor.add_callback(save_and_anonymize)
+        interceptor.add_batch_callback(save_and_anonymize)
         
         # Add starting URL
         crawler.add_url(target_url, depth=0, priority=10)
         
-        # Crawl loop
-        crawled = 0
-        max_pages = 5  # Limit for example
+        # Respect crawl delay between page loads, shared by all workers
+        crawl_delay = robots.get_crawl_delay() or page_delay
+        polite = asyncio.Lock()
+        next_start = 0.0
         
-        while crawled < max_pages:
-            next_url = crawler.get_next_url()
-            if not next_url:
-                break
-            
-            depth, page_url = next_url
-            
-            # Check robots.txt
-            if not robots.is_allowed(page_url):
-                print(f"🚫 Blocked by robots.txt: {page_url}")
-                continue
-            
-            print(f"\n🔍 Crawling (depth {depth}): {page_url}")
-            
-            # Create page
-            page = await browser.new_page()
+        async def prepare_page(page):
+            nonlocal next_start
             await interceptor.attach(page)
-            
-            # Crawl page
-            links = await crawler.crawl_page(page, page_url)
-            
-            # Add new links
-            for link in links[:5]:  # Limit links for example
-                crawler.add_url(link, depth=depth + 1)
-            
-            await page.close()
-            crawled += 1
-            
-            # Respect crawl delay
-            crawl_delay = robots.get_crawl_delay() or config.get('scraping', {}).get('page_delay', 2000) / 1000
-            await asyncio.sleep(crawl_delay)
+            async with polite:
+                loop = asyncio.get_running_loop()
+                await asyncio.sleep(max(0.0, next_start - loop.time()))
+                next_start = loop.time() + crawl_delay
+        
+        # Check robots.txt
+        def allowed(page_url):
+            if robots.is_allowed(page_url):
+                return True
+            print(f"🚫 Blocked by robots.txt: {page_url}")
+            return False
+        
+        def crawled(depth, page_url):
+            print(f"🔍 Crawled (depth {depth}): {page_url}")
+        
+        # Crawl up to max_concurrent pages at once
+        max_pages = 5  # Limit for example
+        await crawler.crawl_all(
+            browser,
+            on_page=prepare_page,
+            on_crawled=crawled,
+            max_pages=max_pages,
+            url_filter=allowed,
+        )
+        
+        # Deliver APIs still waiting for the next batch
+        await interceptor.flush()
         
         # Print summary
         print("\n" + "="*60)
@@ -130,4 +135,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(main())
@@ -14,17 +14,21 @@ from rich.table import Table
 from pathlib import Path
 import yaml
 from loguru import logger
+import orjson
 import sys
 
-from core.browser import StealthBrowser
+from core.browser import BrowserPool
 from core.crawler import SmartCrawler
 from core.interceptor import NetworkInterceptor
-from core.database import DatabaseManager
-from utils.helpers import load_yaml_config, ensure_directory
+from core.database import DatabaseManager, ENDPOINT_COLUMNS
+from utils.helpers import load_yaml_config, ensure_directory, install_uvloop
 
 app = typer.Typer(help="🕷️ API Scraper Pro - Automated API Discovery & Scraping")
 console = Console()
 
+# Endpoints fetched and written per export batch
+EXPORT_BATCH = 1000
+
 
 def setup_logging(config: dict) -> None:
     """Setup logging configuration."""
@@ -76,27 +80,39 @@ def scrape(
         border_style="cyan"
     ))
     
-    asyncio.run(run_scraper(url, cfg, output))
+    asyncio.run(scrape_once(url, cfg, output))
+    
+    # Keep window open to show results
+    console.print("\n" + "="*60)
+    console.print("[bold cyan]Press ENTER to close this window...[/bold cyan]")
+    console.print("="*60)
+    input()  # Wait for user input before closing
+
+
+async def scrape_once(url: str, config: dict, output: str = None):
+    """Run a single scrape, then shut down the shared browser."""
+    try:
+        await run_scraper(url, config, output)
+    finally:
+        await BrowserPool.close()
 
 
 async def run_scraper(url: str, config: dict, output: str = None):
     """Main async scraper logic."""
     logger.info(f"Starting scrape: {url}")
     
-    browser_config = config.get('scraping', {})
-    browser_config.update(config.get('stealth', {}))
+    scraping_config = config.get('scraping', {})
+    # Merged copy; the caller's scraping section is left as it was
+    browser_config = {**scraping_config, **config.get('stealth', {})}
+    
+    # Warm browser is kept alive across runs; pages go back to its context pool
+    browser = await BrowserPool.get(browser_config)
     
-    async with (
-        StealthBrowser(browser_config) as browser,
-        DatabaseManager(config.get('database', {})) as db
-    ):
-        crawler = SmartCrawler(config.get('scraping', {}))
+    async with DatabaseManager(config.get('database', {})) as db:
+        crawler = SmartCrawler(scraping_config)
         interceptor = NetworkInterceptor(config)
         
-        async def save_api_callback(api_data):
-            await db.save_api_call(api_data)
-        
-        interceptor.add_callback(save_api_callback)
+        interceptor.add_batch_callback(db.save_api_calls_batch)
         crawler.add_url(url, depth=0, priority=10)
         
         with Progress(
@@ -107,27 +123,14 @@ async def run_scraper(url: str, config: dict, output: str = None):
             console=console
         ) as progress:
             task = progress.add_task("[cyan]Crawling...", total=None)
-            crawled_count = 0
             
-            while True:
-                next_url = crawler.get_next_url()
-                if not next_url:
-                    break
-                
-                depth, page_url = next_url
-                progress.update(task, description=f"[cyan]Crawling (depth {depth}): {page_url[:60]}...")
-                
-                page = await browser.new_page()
-                await interceptor.attach(page)
-                links = await crawler.crawl_page(page, page_url)
-                
-                for link in links:
-                    crawler.add_url(link, depth=depth + 1)
-                
-                await page.close()
-                crawled_count += 1
-                progress.update(task, advance=1)
+            def on_crawled(depth: int, page_url: str) -> None:
+                progress.update(task, description=f"[cyan]Crawled (depth {depth}): {page_url[:60]}...", advance=1)
+            
+            # max_concurrent pages load at once, each on its own pooled page
+            await crawler.crawl_all(browser, on_page=interceptor.attach, on_crawled=on_crawled)
         
+        await interceptor.flush()
         console.print("\n")
         console.print(Panel.fit("[bold green]✅ Scraping complete![/bold green]", border_style="green"))
         
@@ -151,12 +154,6 @@ async def run_scraper(url: str, config: dict, output: str = None):
             console.print(f"\n[green]✅ Data exported: {output}[/green]")
         
         logger.success("Scraping completed successfully!")
-        
-        # Keep window open to show results
-        console.print("\n" + "="*60)
-        console.print("[bold cyan]Press ENTER to close this window...[/bold cyan]")
-        console.print("="*60)
-        input()  # Wait for user input before closing
 
 
 @app.command()
@@ -217,22 +214,47 @@ async def export_data_cmd(config: dict, output: str, format: str):
 
 
 async def export_data(db: DatabaseManager, output: str, format: str):
-    """Export data to file."""
-    import json
-    endpoints = await db.get_all_endpoints()
-    
+    """Export data to file, streaming endpoints in batches."""
     if format == 'json':
-        with open(output, 'w', encoding='utf-8') as f:
-            json.dump(endpoints, f, indent=2, ensure_ascii=False)
+        with open(output, 'wb') as f:
+            await _write_json_stream(db, f)
     elif format == 'csv':
-        import csv
         with open(output, 'w', encoding='utf-8', newline='') as f:
-            if not endpoints:
-                return
-            fieldnames = endpoints[0].keys()
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(endpoints)
+            await _write_csv_stream(db, f)
+
+
+async def _write_json_stream(db: DatabaseManager, f) -> None:
+    """Write endpoints as an indented JSON array, one batch at a time."""
+    first = True
+    async for endpoints in db.iter_endpoint_batches(EXPORT_BATCH):
+        # One encoder call per batch; splice the batch arrays into a single array
+        chunk = orjson.dumps(endpoints, option=orjson.OPT_INDENT_2)
+        chunk = chunk[:-2] if first else b',\n' + chunk[2:-2]
+        first = False
+        await asyncio.to_thread(f.write, chunk)
+    
+    await asyncio.to_thread(f.write, b'[]' if first else b'\n]')
+
+
+async def _write_csv_stream(db: DatabaseManager, f) -> None:
+    """Write endpoints as CSV, one batch at a time."""
+    import csv
+    import io
+    from operator import itemgetter
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(ENDPOINT_COLUMNS)
+    # writerows with a C-level map keeps the per-row loop out of the interpreter
+    row_values = itemgetter(*ENDPOINT_COLUMNS)
+    async for endpoints in db.iter_endpoint_batches(EXPORT_BATCH):
+        writer.writerows(map(row_values, endpoints))
+        await asyncio.to_thread(f.write, buffer.getvalue())
+        buffer.seek(0)
+        buffer.truncate()
+    
+    if buffer.tell():
+        await asyncio.to_thread(f.write, buffer.getvalue())
 
 
 @app.command()
@@ -246,4 +268,6 @@ def dashboard(config: str = typer.Option("config/default.yaml", help="Config fil
 
 
 if __name__ == "__main__":
+    # Entry point only: the dashboard imports this module and keeps its own loops
+    install_uvloop()
     app()
@@ -6,9 +6,11 @@ from .robots import RobotsParser
 from .helpers import (
     load_yaml_config,
     save_yaml_config,
+    clear_yaml_cache,
     ensure_directory,
     format_bytes,
-    truncate_string
+    truncate_string,
+    install_uvloop
 )
 
 __all__ = [
@@ -17,7 +19,9 @@ __all__ = [
     'RobotsParser',
     'load_yaml_config',
     'save_yaml_config',
+    'clear_yaml_cache',
     'ensure_directory',
     'format_bytes',
     'truncate_string',
+    'install_uvloop',
 ]
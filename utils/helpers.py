@@ -6,10 +6,29 @@ Common helper functions used across the application.
 """
 
 import yaml
+import copy
+import functools
+import os
+import sys
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from loguru import logger
 
+# Prefer the libyaml-backed C loader/dumper when PyYAML was built with it
+try:
+    _YAML_LOADER = yaml.CSafeLoader
+    _YAML_DUMPER = yaml.CSafeDumper
+except AttributeError:
+    _YAML_LOADER = yaml.SafeLoader
+    _YAML_DUMPER = yaml.SafeDumper
+
+# Parsed configs keyed by real path: (mtime_ns, size, config)
+_YAML_CACHE: "OrderedDict[str, Tuple[int, int, Dict[str, Any]]]" = OrderedDict()
+_YAML_CACHE_MAX = 100
+
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
 
 def load_yaml_config(config_path: str = "config/default.yaml") -> Dict[str, Any]:
     """
@@ -22,10 +41,24 @@ def load_yaml_config(config_path: str = "config/default.yaml") -> Dict[str, Any]
         Dictionary containing configuration or empty dict if file not found
     """
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-            logger.debug(f"Configuration loaded from {config_path}")
-            return config
+        key = os.path.realpath(config_path)
+        stat = os.stat(key)
+        
+        cached = _YAML_CACHE.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            _YAML_CACHE.move_to_end(key)
+            # Callers mutate their config, so never hand out the cached object
+            return copy.deepcopy(cached[2])
+        
+        with open(key, 'r', encoding='utf-8') as f:
+            config = yaml.load(f, Loader=_YAML_LOADER)
+        logger.debug(f"Configuration loaded from {config_path}")
+        
+        _YAML_CACHE[key] = (stat.st_mtime_ns, stat.st_size, config)
+        _YAML_CACHE.move_to_end(key)
+        if len(_YAML_CACHE) > _YAML_CACHE_MAX:
+            _YAML_CACHE.popitem(last=False)
+        return copy.deepcopy(config)
     except FileNotFoundError:
         logger.warning(f"Config file not found: {config_path}, using defaults")
         return {}
@@ -48,7 +81,8 @@ def save_yaml_config(config: Dict[str, Any], config_path: str = "config/default.
     try:
         Path(config_path).parent.mkdir(parents=True, exist_ok=True)
         with open(config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(config, f, Dumper=_YAML_DUMPER, default_flow_style=False, sort_keys=False)
+        clear_yaml_cache(config_path)
         logger.debug(f"Configuration saved to {config_path}")
         return True
     except Exception as e:
@@ -56,6 +90,19 @@ def save_yaml_config(config: Dict[str, Any], config_path: str = "config/default.
         return False
 
 
+def clear_yaml_cache(config_path: Optional[str] = None) -> None:
+    """
+    Invalidate cached configuration.
+    
+    Args:
+        config_path: Path to invalidate, or None to clear all entries
+    """
+    if config_path is None:
+        _YAML_CACHE.clear()
+    else:
+        _YAML_CACHE.pop(os.path.realpath(config_path), None)
+
+
 def ensure_directory(path: str) -> Path:
     """
     Ensure directory exists, create if not.
@@ -71,6 +118,7 @@ def ensure_directory(path: str) -> Path:
     return directory
 
 
+@functools.lru_cache(maxsize=4096)
 def format_bytes(size_bytes: int) -> str:
     """
     Format bytes to human-readable string.
@@ -81,13 +129,12 @@ def format_bytes(size_bytes: int) -> str:
     Returns:
         Formatted string (e.g., "1.5 MB")
     """
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} TB"
+    # Each unit is 10 more bits; dividing by a power of two is exact, as the old loop was
+    unit_idx = min(len(_BYTE_UNITS) - 1, (int(size_bytes).bit_length() - 1) // 10) if size_bytes >= 1024 else 0
+    return f"{size_bytes / (1 << (10 * unit_idx)):.2f} {_BYTE_UNITS[unit_idx]}"
 
 
+@functools.lru_cache(maxsize=2048)
 def truncate_string(text: str, max_length: int = 80, suffix: str = "...") -> str:
     """
     Truncate string to maximum length.
@@ -103,3 +150,25 @@ def truncate_string(text: str, max_length: int = 80, suffix: str = "...") -> str
     if len(text) <= max_length:
         return text
     return text[:max_length - len(suffix)] + suffix
+
+
+def install_uvloop() -> bool:
+    """
+    Make asyncio.run() use uvloop when it is installed (not available on Windows).
+    
+    Call from entry points only; the event loop policy is process-wide.
+    
+    Returns:
+        True if uvloop was installed
+    """
+    if sys.platform == 'win32':
+        return False
+    
+    try:
+        import uvloop
+    except ImportError:
+        logger.debug("uvloop not available, using the default asyncio event loop")
+        return False
+    
+    uvloop.install()
+    return True
@@ -5,10 +5,67 @@ Data Normalizer - PII Anonymization & Data Cleaning
 Normalizes and anonymizes personally identifiable information.
 """
 
-from typing import Any, Dict, List, Set
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Set
+import functools
 import re
 from loguru import logger
 
+# Compiled once at import and shared read-only by every normalizer
+_PII_PATTERNS: Mapping[str, re.Pattern] = MappingProxyType({
+    # Bounded to RFC 5321 lengths, so backtracking is linear in the text
+    'email': re.compile(r'\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,63}\b'),
+    'phone': re.compile(r'\b(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b'),
+    'ssn': re.compile(r'\b\d{3}-\d{2}-\d{4}\b'),
+    'credit_card': re.compile(r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b'),
+})
+
+# Alternation order of the fused PII scanner
+PII_SCAN_ORDER = {'email': 0, 'credit_card': 1, 'ssn': 2, 'phone': 3}
+
+# Every PII pattern needs an '@' or a digit; strings without one skip the scanner
+_PII_TRIGGER = re.compile(r'[@\d]')
+
+# Joins candidate strings for one scanner pass; no PII pattern can match across it
+_BATCH_SEPARATOR = '\x00'
+
+# Strings up to this length are masked through a per-instance cache (status codes, dates, ...)
+SHORT_STRING_MAX = 64
+MASK_CACHE_SIZE = 8192
+
+
+def _mask(value_str: str) -> str:
+    """Keep first and last character, star the rest (strings of 2 or fewer become all stars)."""
+    if len(value_str) <= 2:
+        return '*' * len(value_str)
+    # ljust pads in C, so only one temporary string is built
+    return value_str[0].ljust(len(value_str) - 1, '*') + value_str[-1]
+
+
+def _build_scanner(patterns: Mapping[str, re.Pattern]) -> re.Pattern:
+    """Fuse PII patterns into one alternation; the matching group names the PII type."""
+    # Most specific first, so e.g. a card number is not also reported as a phone number
+    ordered = sorted(patterns, key=lambda name: PII_SCAN_ORDER.get(name, len(PII_SCAN_ORDER)))
+    return re.compile('|'.join(f'(?P<{name}>{patterns[name].pattern})' for name in ordered))
+
+
+_PII_SCANNER = _build_scanner(_PII_PATTERNS)
+
+
+def _mask_match(match: re.Match) -> str:
+    """Mask one match of the fused PII scanner (plain function: no method dispatch per match)."""
+    value = match.group()
+    masked = _mask(value)
+    # Brace-style arguments are only formatted if DEBUG is enabled
+    logger.debug("Anonymized {}: {} -> {}", match.lastgroup, value, masked)
+    return masked
+
+
+@functools.lru_cache(maxsize=4096)
+def _lower(key: str) -> str:
+    """Lowercase dict key; API records repeat the same keys, so this is mostly a cache hit."""
+    return key.lower()
+
 
 class DataNormalizer:
     """Normalizes and anonymizes API data."""
@@ -19,58 +76,97 @@ class DataNormalizer:
         self.anonymize_pii = self.compliance.get('anonymize_pii', True)
         self.pii_fields = set(self.compliance.get('pii_fields', []))
         
-        self.patterns = {
-            'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
-            'phone': re.compile(r'\b(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b'),
-            'ssn': re.compile(r'\b\d{3}-\d{2}-\d{4}\b'),
-            'credit_card': re.compile(r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b'),
+        self.patterns = _PII_PATTERNS
+        self._pii_scanner = _PII_SCANNER
+        # Per-instance, so each normalizer's patterns have their own cache
+        self._mask_short = functools.lru_cache(maxsize=MASK_CACHE_SIZE)(self._mask_pii_in_string)
+        # PII field -> first pattern type named in it (None: field is masked but not typed)
+        self._field_types = {
+            field: next((pii_type for pii_type in self.patterns if pii_type in field), None)
+            for field in self.pii_fields
         }
     
-    def anonymize(self, data: Any, depth: int = 0, max_depth: int = 10) -> Any:
-        """Anonymize PII in data."""
-        if not self.anonymize_pii or depth >= max_depth:
+    def anonymize(self, data: Any, max_depth: int = 10) -> Any:
+        """Anonymize PII in data (iterative; containers nested max_depth deep are kept as is)."""
+        if not self.anonymize_pii:
             return data
+        return self.anonymize_batch([data], max_depth)[0]
+    
+    def anonymize_batch(self, records: List[Any], max_depth: int = 10) -> List[Any]:
+        """Anonymize PII in many records, scanning all their candidate strings in one regex pass."""
+        if not self.anonymize_pii:
+            return list(records)
         
-        if isinstance(data, dict):
-            return {key: self._anonymize_value(key, value, depth) for key, value in data.items()}
-        elif isinstance(data, list):
-            return [self.anonymize(item, depth + 1, max_depth) for item in data]
-        else:
-            return data
+        roots = list(records)
+        # Each entry rebuilds one container into its parent's pre-filled slot
+        stack = [(record, 0, roots, index) for index, record in enumerate(records)]
+        # (container, slot) of strings that may hold PII, masked together at the end
+        pending = []
+        
+        while stack:
+            value, depth, parent, slot = stack.pop()
+            if depth >= max_depth:
+                continue  # Slot already holds the original value
+            
+            if isinstance(value, dict):
+                out = parent[slot] = {}
+                for key, item in value.items():
+                    if _lower(key) in self.pii_fields:
+                        out[key] = self._mask_value(item)
+                    elif isinstance(item, (dict, list)):
+                        out[key] = item
+                        stack.append((item, depth + 1, out, key))
+                    else:
+                        out[key] = item
+                        if isinstance(item, str) and _PII_TRIGGER.search(item):
+                            pending.append((out, key))
+            elif isinstance(value, list):
+                out = parent[slot] = list(value)
+                for index, item in enumerate(value):
+                    if isinstance(item, (dict, list)):
+                        stack.append((item, depth + 1, out, index))
+        
+        self._mask_pending(pending)
+        return roots
     
-    def _anonymize_value(self, key: str, value: Any, depth: int) -> Any:
-        """Anonymize single value."""
-        if key.lower() in self.pii_fields:
-            return self._mask_value(value)
+    def _mask_pending(self, pending: List[tuple]) -> None:
+        """Mask PII in the strings at the given (container, slot) places."""
+        # Short values repeat across records; serve them from the cache
+        long_pending = []
+        for parent, slot in pending:
+            text = parent[slot]
+            if len(text) <= SHORT_STRING_MAX:
+                parent[slot] = self._mask_short(text)
+            else:
+                long_pending.append((parent, slot))
         
-        if isinstance(value, (dict, list)):
-            return self.anonymize(value, depth + 1)
+        pending = long_pending
+        if not pending:
+            return
         
-        if isinstance(value, str):
-            return self._mask_pii_in_string(value)
+        texts = [parent[slot] for parent, slot in pending]
+        joined = _BATCH_SEPARATOR.join(texts)
+        if joined.count(_BATCH_SEPARATOR) != len(texts) - 1:
+            # A string contains the separator itself; splitting would misalign
+            masked = [self._pii_scanner.sub(_mask_match, text) for text in texts]
+        else:
+            masked = self._pii_scanner.sub(_mask_match, joined).split(_BATCH_SEPARATOR)
         
-        return value
+        for (parent, slot), text in zip(pending, masked):
+            parent[slot] = text
     
     def _mask_value(self, value: Any) -> str:
         """Mask value with asterisks."""
         if value is None:
             return None
         
-        value_str = str(value)
-        if len(value_str) <= 2:
-            return '*' * len(value_str)
-        
-        return value_str[0] + '*' * (len(value_str) - 2) + value_str[-1]
+        return _mask(str(value))
     
     def _mask_pii_in_string(self, text: str) -> str:
-        """Mask PII patterns in string."""
-        for pii_type, pattern in self.patterns.items():
-            matches = pattern.findall(text)
-            for match in matches:
-                masked = self._mask_value(match)
-                text = text.replace(match, masked)
-                logger.debug(f"Anonymized {pii_type}: {match} -> {masked}")
-        return text
+        """Mask PII patterns in string (single pass over text)."""
+        if not _PII_TRIGGER.search(text):
+            return text
+        return self._pii_scanner.sub(_mask_match, text)
     
     def detect_pii(self, data: Any) -> Dict[str, List[str]]:
         """Detect PII fields in data."""
@@ -85,11 +181,9 @@ class DataNormalizer:
         
         if isinstance(data, dict):
             for key, value in data.items():
-                if key.lower() in self.pii_fields and value:
-                    for pii_type in self.patterns.keys():
-                        if pii_type in key.lower():
-                            found_pii[pii_type].append(str(value))
-                            break
+                pii_type = self._field_types.get(_lower(key)) if value else None
+                if pii_type:
+                    found_pii[pii_type].append(str(value))
                 
                 if isinstance(value, str):
                     self._detect_pii_in_string(value, found_pii)
@@ -101,8 +195,8 @@ class DataNormalizer:
                 self._detect_pii_recursive(item, found_pii, depth + 1)
     
     def _detect_pii_in_string(self, text: str, found_pii: Dict[str, List[str]]):
-        """Detect PII patterns in string."""
-        for pii_type, pattern in self.patterns.items():
-            matches = pattern.findall(text)
-            if matches:
-                found_pii[pii_type].extend(matches)
+        """Detect PII patterns in string (single pass over text)."""
+        if not _PII_TRIGGER.search(text):
+            return
+        for match in self._pii_scanner.finditer(text):
+            found_pii[match.lastgroup].append(match.group())
@@ -7,8 +7,13 @@ Handles proxy server rotation and management.
 
 from typing import List, Optional, Dict, Any
 from loguru import logger
+import itertools
 import random
-from urllib.parse import urlparse
+import re
+
+# scheme://[username[:password]@]host[:port] (any path is ignored); like urlparse,
+# userinfo runs to the last '@', so passwords may contain '@'
+_PROXY_RE = re.compile(r'^(?P<scheme>\w+)://(?:(?P<userinfo>[^/]*)@)?(?P<host>[^/@]+)')
 
 
 class ProxyManager:
@@ -20,7 +25,10 @@ class ProxyManager:
         self.rotation = config.get('rotation', True)
         self.timeout = config.get('timeout', 10)
         self.proxies = self._parse_proxies(config.get('providers', []))
-        self.current_index = 0
+        # C-level round-robin instead of index arithmetic per call
+        self._cycle = itertools.cycle(self.proxies) if self.proxies else None
+        # Own generator (seeded from os.urandom) instead of the shared module one
+        self._rng = random.Random()
         
         if self.enabled and self.proxies:
             logger.info(f"Proxy manager initialized ({len(self.proxies)} proxies)")
@@ -32,18 +40,21 @@ class ProxyManager:
         parsed = []
         
         for proxy_url in providers:
-            try:
-                parsed_url = urlparse(proxy_url)
-                proxy_dict = {'server': f"{parsed_url.scheme}://{parsed_url.netloc}"}
-                
-                if parsed_url.username:
-                    proxy_dict['username'] = parsed_url.username
-                if parsed_url.password:
-                    proxy_dict['password'] = parsed_url.password
-                
-                parsed.append(proxy_dict)
-            except Exception as e:
-                logger.warning(f"Proxy parsing failed ({proxy_url}): {e}")
+            match = _PROXY_RE.match(proxy_url)
+            if not match:
+                logger.warning(f"Proxy parsing failed ({proxy_url}): expected scheme://[user[:password]@]host")
+                continue
+            
+            # Credentials go in their own fields, never in the server URL
+            proxy_dict = {'server': f"{match['scheme']}://{match['host']}"}
+            
+            username, _, password = (match['userinfo'] or '').partition(':')
+            if username:
+                proxy_dict['username'] = username
+            if password:
+                proxy_dict['password'] = password
+            
+            parsed.append(proxy_dict)
         
         return parsed
     
@@ -53,8 +64,7 @@ class ProxyManager:
             return None
         
         if self.rotation:
-            proxy = self.proxies[self.current_index]
-            self.current_index = (self.current_index + 1) % len(self.proxies)
+            proxy = next(self._cycle)
         else:
             proxy = self.proxies[0]
         
@@ -66,7 +76,7 @@ class ProxyManager:
         if not self.enabled or not self.proxies:
             return None
         
-        proxy = random.choice(self.proxies)
+        proxy = self._rng.choice(self.proxies)
         logger.debug(f"Random proxy: {proxy['server']}")
         return proxy
     
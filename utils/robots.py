@@ -5,18 +5,140 @@ Robots.txt Parser - Respect Website Crawling Rules
 Reads and respects robots.txt directives.
 """
 
-from urllib.parse import urljoin, urlparse
-from typing import Set, Optional
+from urllib.parse import urljoin, urlparse, urlsplit
+from typing import Dict, FrozenSet, Set, Optional, Tuple
 from loguru import logger
+import asyncio
+import functools
+import io
+import time
 import httpx
 
+# (path, rules) decisions remembered process-wide; parsers of the same site share them
+PATH_CACHE_SIZE = 16_384
+
+# Trie key marking the end of a disallow rule (never a path character)
+_RULE_END = ''
+
+# Up to this many rules one C-level str.startswith(tuple) beats walking the trie
+PREFIX_TUPLE_MAX = 16
+
+# Shared keep-alive client for parsers without their own, bound to the loop that created it
+_shared_client: Optional[httpx.AsyncClient] = None
+_shared_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_shared_client() -> httpx.AsyncClient:
+    """Get the module's shared HTTP client, creating it for the running event loop."""
+    global _shared_client, _shared_client_loop
+    loop = asyncio.get_running_loop()
+    if _shared_client is None or _shared_client_loop is not loop or _shared_client.is_closed:
+        # A client left behind by a finished loop cannot be closed from here; drop it
+        _shared_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=100),
+        )
+        _shared_client_loop = loop
+    return _shared_client
+
+
+# Process-wide robots.txt responses: robots_url -> (expires_at, status_code, text)
+ROBOTS_CACHE_TTL = 3600.0
+ROBOTS_CACHE_SIZE = 1024
+_robots_cache: Dict[str, Tuple[float, int, str]] = {}
+# One in-flight fetch per robots_url; dropped once the response is cached
+_robots_locks: Dict[str, asyncio.Lock] = {}
+
+
+async def _fetch_robots(robots_url: str, client: Optional[httpx.AsyncClient] = None) -> Tuple[int, str]:
+    """Fetch robots.txt (status code, text), served from the TTL cache when fresh."""
+    cached = _robots_cache.get(robots_url)
+    if cached and cached[0] > time.monotonic():
+        return cached[1], cached[2]
+    
+    lock = _robots_locks.setdefault(robots_url, asyncio.Lock())
+    async with lock:
+        # Another parser may have fetched it while we waited
+        cached = _robots_cache.get(robots_url)
+        if cached and cached[0] > time.monotonic():
+            return cached[1], cached[2]
+        
+        try:
+            # Reuse pooled connections instead of a new client (and TLS setup) per load
+            response = await (client or _get_shared_client()).get(robots_url)
+        finally:
+            if _robots_locks.get(robots_url) is lock:
+                del _robots_locks[robots_url]
+        
+        if _is_cacheable(response.status_code):
+            _store_robots(robots_url, response.status_code, response.text)
+        return response.status_code, response.text
+
+
+def _is_cacheable(status_code: int) -> bool:
+    """Check if a robots.txt answer is definite (redirects, 429 and 5xx are likely to change)."""
+    return status_code == 200 or (400 <= status_code < 500 and status_code != 429)
+
+
+def _store_robots(robots_url: str, status_code: int, text: str) -> None:
+    """Cache robots.txt response, keeping at most ROBOTS_CACHE_SIZE entries."""
+    now = time.monotonic()
+    # Re-insert so insertion order stays expiry order
+    _robots_cache.pop(robots_url, None)
+    if len(_robots_cache) >= ROBOTS_CACHE_SIZE:
+        for url in [url for url, (expires_at, _, _) in _robots_cache.items() if expires_at <= now]:
+            del _robots_cache[url]
+        while len(_robots_cache) >= ROBOTS_CACHE_SIZE:
+            del _robots_cache[next(iter(_robots_cache))]
+    _robots_cache[robots_url] = (now + ROBOTS_CACHE_TTL, status_code, text)
+
+
+async def close_shared_client() -> None:
+    """Close the shared HTTP client used by RobotsParser.load."""
+    global _shared_client, _shared_client_loop
+    client, _shared_client, _shared_client_loop = _shared_client, None, None
+    if client is not None:
+        await client.aclose()
+
+
+@functools.lru_cache(maxsize=64)
+def _build_trie(rules: FrozenSet[str]) -> dict:
+    """Build character trie of disallow rules (rule ends marked with _RULE_END)."""
+    trie: dict = {}
+    for rule in rules:
+        node = trie
+        for char in rule:
+            node = node.setdefault(char, {})
+        node[_RULE_END] = True
+    return trie
+
+
+@functools.lru_cache(maxsize=PATH_CACHE_SIZE)
+def _path_allowed(path: str, rules: FrozenSet[str]) -> bool:
+    """Check path against disallow rules (any rule prefix blocks)."""
+    if len(rules) <= PREFIX_TUPLE_MAX:
+        return not path.startswith(tuple(rules))
+    
+    node = _build_trie(rules)
+    for char in path:
+        node = node.get(char)
+        if node is None:
+            return True
+        if _RULE_END in node:
+            return False
+    
+    return True
+
 
 class RobotsParser:
     """Parses and respects robots.txt rules."""
     
-    def __init__(self, respect_robots: bool = True):
+    def __init__(self, respect_robots: bool = True, client: Optional[httpx.AsyncClient] = None):
         self.respect_robots = respect_robots
+        self._client = client
         self.disallowed_paths: Set[str] = set()
+        # Frozen copy of disallowed_paths; hashes once, so it is a cheap cache key
+        self._rules: FrozenSet[str] = frozenset()
         self.crawl_delay: Optional[float] = None
         self._loaded = False
     
@@ -32,15 +154,14 @@ class RobotsParser:
             
             logger.info(f"Loading robots.txt: {robots_url}")
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(robots_url)
-                
-                if response.status_code == 200:
-                    self._parse(response.text)
-                    self._loaded = True
-                    logger.success(f"Robots.txt loaded ({len(self.disallowed_paths)} disallow rules)")
-                else:
-                    logger.warning(f"Robots.txt not found (HTTP {response.status_code})")
+            status_code, text = await _fetch_robots(robots_url, self._client)
+            
+            if status_code == 200:
+                self._parse(text)
+                self._loaded = True
+                logger.success(f"Robots.txt loaded ({len(self.disallowed_paths)} disallow rules)")
+            else:
+                logger.warning(f"Robots.txt not found (HTTP {status_code})")
         
         except Exception as e:
             logger.warning(f"Robots.txt load failed: {e}")
@@ -49,45 +170,60 @@ class RobotsParser:
         """Parse robots.txt content."""
         user_agent_match = False
         
-        for line in content.split('\n'):
+        # Stream lines instead of materializing the whole split list
+        for line in io.StringIO(content):
             line = line.strip()
             
-            if not line or line.startswith('#'):
+            if not line or line[0] == '#':
                 continue
             
-            if ':' in line:
-                directive, value = line.split(':', 1)
-                directive = directive.strip().lower()
-                value = value.strip()
-                
-                if directive == 'user-agent':
-                    user_agent_match = (value == '*')
-                
-                elif directive == 'disallow' and user_agent_match:
-                    if value:
-                        self.disallowed_paths.add(value)
-                
-                elif directive == 'crawl-delay' and user_agent_match:
-                    try:
-                        self.crawl_delay = float(value)
-                        logger.info(f"Crawl delay set: {self.crawl_delay}s")
-                    except ValueError:
-                        pass
+            directive, colon, value = line.partition(':')
+            if colon:
+                handler = self._DIRECTIVES.get(directive.strip().lower())
+                if handler:
+                    user_agent_match = handler(self, value.strip(), user_agent_match)
+        
+        # New rules make a new cache key, so earlier decisions need no invalidation
+        self._rules = frozenset(self.disallowed_paths)
+    
+    def _on_user_agent(self, value: str, user_agent_match: bool) -> bool:
+        """Handle User-agent directive (starts a new group)."""
+        return value == '*'
+    
+    def _on_disallow(self, value: str, user_agent_match: bool) -> bool:
+        """Handle Disallow directive."""
+        if user_agent_match and value:
+            self.disallowed_paths.add(value)
+        return user_agent_match
+    
+    def _on_crawl_delay(self, value: str, user_agent_match: bool) -> bool:
+        """Handle Crawl-delay directive."""
+        if user_agent_match:
+            try:
+                self.crawl_delay = float(value)
+                logger.info(f"Crawl delay set: {self.crawl_delay}s")
+            except ValueError:
+                pass
+        return user_agent_match
+    
+    # Lowercased directive -> handler(self, value, user_agent_match) returning the new match state
+    _DIRECTIVES = {
+        'user-agent': _on_user_agent,
+        'disallow': _on_disallow,
+        'crawl-delay': _on_crawl_delay,
+    }
     
     def is_allowed(self, url: str) -> bool:
         """Check if URL crawling is allowed."""
         if not self.respect_robots or not self._loaded:
             return True
         
-        parsed = urlparse(url)
-        path = parsed.path
-        
-        for disallowed in self.disallowed_paths:
-            if path.startswith(disallowed):
-                logger.debug(f"Robots.txt blocks: {url}")
-                return False
+        # Rules depend on the path alone (query already split off)
+        if _path_allowed(urlsplit(url).path, self._rules):
+            return True
         
-        return True
+        logger.debug(f"Robots.txt blocks: {url}")
+        return False
     
     def get_crawl_delay(self) -> Optional[float]:
         """Get recommended crawl delay."""